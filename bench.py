@@ -0,0 +1,186 @@
+# Benchmarks for ssd1306big.
+#
+# Drives the text functions against a counting I2C stand-in and prints, per
+# operation, the CPU time spent, the number of I2C transactions and the
+# bytes put on the wire. Runs on the board (copy it next to ssd1306big.py
+# and run it) or on a PC with CPython, where the stand-ins in host/ are used:
+#
+#     python bench.py
+#     python bench.py ram
+#
+# Times on a PC are only useful relative to each other; transaction and byte
+# counts are the same as on the device. `ram` prints what importing the
+# module costs in heap instead.
+
+import gc
+import sys
+
+try:
+    import framebuf
+except ImportError:
+    # CPython: use the stand-ins
+    import os
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "host"))
+
+try:
+    from time import ticks_us, ticks_diff
+except ImportError:
+    from time import perf_counter
+
+    def ticks_us():
+        return int(perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+import ssd1306big
+
+
+class CountingI2C:
+    # accepts every write and counts transactions and bytes
+    def __init__(self):
+        self.transactions = 0
+        self.bytes = 0
+
+    def writeto(self, addr, buf, stop=True):
+        self.transactions += 1
+        self.bytes += len(buf)
+        return 1
+
+    def writevto(self, addr, vector, stop=True):
+        self.transactions += 1
+        for buf in vector:
+            self.bytes += len(buf)
+        return 1
+
+    def reset(self):
+        self.transactions = 0
+        self.bytes = 0
+
+
+def full_screen():
+    ssd1306big.clear()
+    ssd1306big.flow("THE QUICK BROWN FOX JUMP")
+
+
+def wrap_text():
+    ssd1306big.clear()
+    ssd1306big.wrap("HELLO WORLD")
+
+
+_tick = [0]
+
+
+def digit_change():
+    # a clock readout where only the last digit changes
+    _tick[0] = (_tick[0] + 1) % 10
+    p = ssd1306big.line1Array[4]
+    ssd1306big.oled.fill_rect(p.x, p.y, ssd1306big.GLYPH_WIDTH, ssd1306big.GLYPH_HEIGHT, 0)
+    ssd1306big.display("0123456789"[_tick[0]], [p])
+
+
+def hello_world():
+    # the loop in hello_world.py, without the sleeps
+    ssd1306big.clear()
+    ssd1306big.wrap("Hello")
+    ssd1306big.clear()
+    ssd1306big.wrap("World")
+
+
+def identical_redraw():
+    ssd1306big.clear()
+    ssd1306big.wrap("HELLO WORLD")
+
+
+def repeated_label():
+    # the same label over and over, from the strip cache
+    ssd1306big.clear()
+    ssd1306big.label("HUMIDITY")
+
+
+GLYPHS = (
+    "A", "B", "C", "D", "E", "F", "G", "H", "I", "J", "K", "L", "M", "N", "O", "P",
+    "Q", "R", "S", "T", "U", "V", "W", "X", "Y", "Z", "period", "exclam", "plus",
+    "minus", "equal", "comma", "colon", "slash", "question", "amp", "zero", "one",
+    "two", "three", "four", "five", "six", "seven", "eight", "nine", "space",
+)
+
+
+def glyphs():
+    # every glyph function once, drawing only
+    p = ssd1306big.displayArray[0]
+    for name in GLYPHS:
+        getattr(ssd1306big, name)(p)
+
+
+# name, function, driver options
+WORKLOADS = (
+    ("full screen flow", full_screen, {}),
+    ("wrap", wrap_text, {}),
+    ("single digit change", digit_change, {}),
+    ("hello_world loop", hello_world, {}),
+    ("identical redraw", identical_redraw, {}),
+    ("identical redraw, double_buffer", identical_redraw, {"double_buffer": True}),
+    ("repeated label", repeated_label, {}),
+    ("all glyph functions", glyphs, {}),
+)
+
+
+def measure(function, repeat=20, **options):
+    # returns (us per call, transactions per call, bytes per call)
+    bus = CountingI2C()
+    previous = ssd1306big.oled
+    ssd1306big.use(ssd1306big.SSD1306_I2C(ssd1306big.WIDTH, ssd1306big.HEIGHT, bus, **options))
+    try:
+        # the first call rasterizes glyphs and fills the shadow buffer
+        function()
+        bus.reset()
+        start = ticks_us()
+        for _ in range(repeat):
+            function()
+        elapsed = ticks_diff(ticks_us(), start)
+    finally:
+        ssd1306big.use(previous)
+    return elapsed // repeat, bus.transactions // repeat, bus.bytes // repeat
+
+
+def run(repeat=20, workloads=WORKLOADS):
+    print("%-34s %10s %8s %8s" % ("operation", "us", "txns", "bytes"))
+    results = {}
+    for name, function, options in workloads:
+        result = measure(function, repeat, **options)
+        results[name] = result
+        print("%-34s %10d %8d %8d" % ((name,) + result))
+    return results
+
+
+def ram(name="ssd1306big"):
+    # bytes of heap a fresh import of the module takes, measured with
+    # gc.mem_free() on the board and tracemalloc on a PC
+    loaded = sys.modules.pop(name, None)
+    try:
+        gc.collect()
+        if hasattr(gc, "mem_free"):
+            before = gc.mem_free()
+            __import__(name)
+            gc.collect()
+            cost = before - gc.mem_free()
+        else:
+            import tracemalloc
+            tracemalloc.start()
+            __import__(name)
+            gc.collect()
+            cost = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+    finally:
+        if loaded is not None:
+            sys.modules[name] = loaded
+    print("%s: %d bytes after import" % (name, cost))
+    return cost
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "ram":
+        ram()
+    else:
+        run(int(sys.argv[1]) if len(sys.argv) > 1 else 20)
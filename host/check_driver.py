@@ -0,0 +1,245 @@
+# Randomized check of the driver's send paths against the emulated panel.
+#
+# Draws random shapes and text on every supported panel size, over I2C and
+# SPI, with and without double_buffer and with chunked() windows, showing at
+# random points. After every show() the panel must hold exactly what is in
+# the framebuffer, so partial page/column windows, merged pages, bursts,
+# chunks and the shadow diff all get exercised.
+#
+# Two reference checks follow. Random lines are written with retain on, at
+# every font size, mixed with scoped clears, labels, draw_at() and the
+# like; every cell retain thinks it knows must show just that character,
+# and plain line updates must leave the same pixels as clearing the screen
+# and drawing the lines afresh. Last, every glyph is compared with golden.py,
+# the glyphs the original module drew.
+#
+#     python host/check_driver.py [rounds] [seed]
+
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from array import array
+
+import golden
+import ssd1306big
+import ssd1306emu
+
+SIZES = ((128, 64), (128, 32), (96, 16), (72, 40), (64, 48))
+CHUNKS = (0, 16, 24)
+
+
+def scribble(screen, rnd, ticker=None):
+    # one random drawing operation, mostly small ones
+    w = screen.width
+    h = screen.height
+    op = rnd.randrange(12)
+    x = rnd.randrange(-8, w + 8)
+    y = rnd.randrange(-8, h + 8)
+    c = rnd.randrange(2)
+    if op == 0:
+        screen.fill_rect(x, y, rnd.randrange(1, 40), rnd.randrange(1, 24), c)
+    elif op == 1:
+        screen.line(x, y, rnd.randrange(-8, w + 8), rnd.randrange(-8, h + 8), c)
+    elif op == 2:
+        screen.pixel(x, y, c)
+    elif op == 3:
+        screen.hline(x, y, rnd.randrange(1, w), c)
+    elif op == 4:
+        screen.vline(x, y, rnd.randrange(1, h), c)
+    elif op == 5:
+        screen.rect(x, y, rnd.randrange(1, 40), rnd.randrange(1, 24), c, rnd.randrange(2))
+    elif op == 6:
+        screen.ellipse(x, y, rnd.randrange(12), rnd.randrange(12), c, rnd.randrange(2), rnd.randrange(16))
+    elif op == 7:
+        coords = array("h", [rnd.randrange(-10, 30) for _ in range(2 * rnd.randrange(1, 6))])
+        screen.poly(x, y, coords, c, rnd.randrange(2))
+    elif op == 8:
+        ssd1306big.draw_at(rnd.choice(("AB", "7", "HI!", "0.5")), x, y, scale=rnd.choice((1, 2, 3)))
+    elif op == 9:
+        if ssd1306big.lineArrays:
+            n = rnd.randrange(len(ssd1306big.lineArrays)) + 1
+            ssd1306big.line(n, rnd.choice(("", "A", "21.5", "HELLO", "XYZ")))
+    elif op == 10:
+        if ticker is not None:
+            # sends only the columns the text moved through
+            ticker.step(rnd.randrange(1, 9))
+    elif rnd.randrange(4) == 0:
+        # marks everything, so keep it rare
+        screen.scroll(rnd.randrange(-3, 4), rnd.randrange(-3, 4))
+
+
+def run(rounds=200, seed=1):
+    checked = 0
+    for width, height in SIZES:
+        for transport in (ssd1306emu.emulated, ssd1306emu.emulated_spi):
+            for double_buffer in (False, True):
+                for chunk in CHUNKS:
+                    rnd = random.Random(seed)
+                    screen, panel = transport(width, height, double_buffer=double_buffer)
+                    screen.chunked(chunk)
+                    ssd1306big.use(screen)
+                    ssd1306big.retain = rnd.randrange(2) == 1
+                    ticker = None
+                    if height >= 32:
+                        ticker = ssd1306big.Marquee("GO 21.5", y=rnd.randrange(height - 24), gap=rnd.randrange(60))
+                    for _ in range(rounds):
+                        scribble(screen, rnd, ticker)
+                        if double_buffer and rnd.randrange(8) == 0:
+                            # behind the driver's back: only the diff finds it
+                            screen.buffer[rnd.randrange(len(screen.buffer))] = rnd.randrange(256)
+                        if rnd.randrange(2) == 0:
+                            screen.show()
+                            ssd1306emu.check(screen, panel)
+                            checked += 1
+                    screen.show()
+                    ssd1306emu.check(screen, panel)
+                    checked += 1
+    ssd1306big.retain = False
+    ssd1306big.use(None)
+    return checked
+
+
+TEXTS = ("", "A", "AB,", "EEEEEEEE", "21.5", "HELLO", "XYZ", "Q,J", "1:00", "MMMMMMMMMMMMMMMMMMMM")
+
+
+def fresh(screen, scale, rows):
+    # what the retained screen should look like: the same lines, drawn once
+    ssd1306big.use(screen, scale)
+    ssd1306big.retain = False
+    screen.fill(0)
+    for n, text in enumerate(rows):
+        ssd1306big.draw(text, ssd1306big.lineArrays[n])
+    return bytes(screen.buffer)
+
+
+def check_cells(screen):
+    # every cell retain thinks it knows must show exactly that character,
+    # blank around it, or the next retained update would leave stray ink
+    for p in ssd1306big.displayArray:
+        if p.ch is None:
+            continue
+        w, h = ssd1306big.glyph_size(p.scale)
+        expected = ssd1306big.Bitmap(w, h)
+        source = ssd1306big.bitmap(p.ch, p.scale)
+        if source is not None:
+            expected.blit(source, 0, 0, 0)
+        for x in range(max(0, -p.x), min(w, screen.width - p.x)):
+            for y in range(max(0, -p.y), min(h, screen.height - p.y)):
+                if screen.pixel(p.x + x, p.y + y) != expected.pixel(x, y):
+                    raise AssertionError("cell at %d,%d doesn't show %r" % (p.x, p.y, p.ch))
+
+
+def meddle(screen, rnd, rows, ticker):
+    # something other than line() that draws over or clears cells
+    op = rnd.randrange(7)
+    x = rnd.randrange(-8, screen.width)
+    y = rnd.randrange(-8, screen.height)
+    if op == 0:
+        n = rnd.randrange(len(rows))
+        ssd1306big.clear_line(n + 1)
+        rows[n] = ""
+    elif op == 1:
+        n = rnd.randrange(len(rows))
+        i = rnd.randrange(len(ssd1306big.lineArrays[n]))
+        ssd1306big.clear_cell(ssd1306big.lineArrays[n][i])
+        rows[n] = (rows[n] + " " * i)[:i] + " " + rows[n][i + 1:]
+    elif op == 2:
+        ssd1306big.clear_rect(x, y, rnd.randrange(1, 40), rnd.randrange(1, 24))
+    elif op == 3:
+        ssd1306big.label(rnd.choice(TEXTS[1:]), x, y, scale=rnd.choice((1, 2)))
+    elif op == 4:
+        ssd1306big.draw_at(rnd.choice(TEXTS[1:]), x, y, rnd.choice((None, ssd1306big.proportional)), rnd.choice((1, 2, 3)))
+    elif op == 5:
+        getattr(ssd1306big, rnd.choice(("A", "E", "comma", "eight")))(rnd.choice(ssd1306big.displayArray))
+    elif ticker is not None:
+        ticker.step(rnd.randrange(1, 9))
+    screen.show()
+
+
+def run_retained(rounds=200, seed=1):
+    # Random line() updates with retain on, mixed with scoped clears,
+    # labels, draw_at(), glyph functions and a marquee. After every call the
+    # known cells must show their characters; while nothing but line() and
+    # clear() has drawn, the whole screen must equal the lines drawn afresh.
+    checked = 0
+    for width, height in SIZES:
+        for scale in (1, 2, 3):
+            rnd = random.Random(seed)
+            screen, panel = ssd1306emu.emulated(width, height)
+            reference, _ = ssd1306emu.emulated(width, height)
+            ssd1306big.use(screen, scale)
+            rows = [""] * len(ssd1306big.lineArrays)
+            ticker = None
+            if height >= 32:
+                ticker = ssd1306big.Marquee("GO 21.5", y=rnd.randrange(height - 24), gap=rnd.randrange(60), screen=screen)
+            meddled = True
+            for _ in range(rounds if rows else 0):
+                ssd1306big.use(screen, scale)
+                ssd1306big.retain = True
+                if meddled and rnd.randrange(8) == 0:
+                    ssd1306big.clear()
+                    ssd1306big.flush()
+                    rows = [""] * len(rows)
+                    meddled = False
+                if rnd.randrange(3) == 0:
+                    meddle(screen, rnd, rows, ticker)
+                    meddled = True
+                else:
+                    n = rnd.randrange(len(rows))
+                    rows[n] = rnd.choice(TEXTS)
+                    ssd1306big.line(n + 1, rows[n])
+                ssd1306emu.check(screen, panel)
+                check_cells(screen)
+                if not meddled and fresh(reference, scale, rows) != bytes(screen.buffer):
+                    raise AssertionError("retained %dx%d scale %d differs from the lines drawn afresh" % (width, height, scale))
+                checked += 1
+    ssd1306big.retain = False
+    ssd1306big.use(None)
+    return checked
+
+
+def run_glyphs():
+    # Every glyph at the native size must match the original module's
+    # line() drawing: from bitmap(), from the glyph functions, and from the
+    # frozen font compile_font.py makes.
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "tools"))
+    import compile_font
+    index, offsets, widths, bitmaps = compile_font.compile_font(*compile_font.load_font(ssd1306big.__file__))
+    screen, panel = ssd1306emu.emulated()
+    ssd1306big.use(screen)
+    names = dict(zip(ssd1306big._glyphChars, ssd1306big._glyphNames))
+    checked = 0
+    for ch, data in golden.GLYPHS.items():
+        drawn = ssd1306big.Bitmap(golden.WIDTH, golden.HEIGHT)
+        source = ssd1306big.bitmap(ch)
+        if source is not None:
+            drawn.blit(source, 0, 0, 0)
+        screen.fill(0)
+        getattr(ssd1306big, names.get(ch, ch))(ssd1306big.Pos(0, 0))
+        frozen = bytearray(len(data))
+        n = index[ord(ch) - compile_font.FIRST]
+        if n:
+            width = widths[n - 1]
+            offset = offsets[2 * n - 2] | offsets[2 * n - 1] << 8
+            for page in range((golden.HEIGHT + 7) // 8):
+                frozen[page * golden.WIDTH:page * golden.WIDTH + width] = bitmaps[offset + page * width:offset + (page + 1) * width]
+        for x in range(golden.WIDTH):
+            for y in range(golden.HEIGHT):
+                bit = data[(y >> 3) * golden.WIDTH + x] >> (y & 7) & 1
+                if drawn.pixel(x, y) != bit or screen.pixel(x, y) != bit or frozen[(y >> 3) * golden.WIDTH + x] >> (y & 7) & 1 != bit:
+                    raise AssertionError("glyph %r differs from the original at %d,%d" % (ch, x, y))
+        checked += 1
+    ssd1306big.use(None)
+    return checked
+
+
+if __name__ == "__main__":
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    seed = int(sys.argv[2]) if len(sys.argv) > 2 else 1
+    print("ok, %d frames checked" % run(rounds, seed))
+    print("ok, %d retained updates checked" % run_retained(rounds, seed))
+    print("ok, %d glyphs match the original" % run_glyphs())
@@ -0,0 +1,255 @@
+# Stand-in for MicroPython's framebuf module, for running on CPython.
+#
+# Only the MONO_VLSB format used by the SSD1306 is implemented. Drawing
+# follows the C implementation pixel for pixel (line() is the same Bresenham
+# walk), so buffers rendered here match the ones rendered on the device.
+# Methods call each other as FrameBuffer.method(self, ...), never through
+# self: in C a subclass's overrides don't see those inner calls either, and
+# the emulator must not hide an override that forgets to mark what it drew.
+
+MONO_VLSB = 0
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+
+def _div(a, b):
+    # C integer division, which truncates towards zero
+    q = abs(a) // abs(b)
+    return q if (a < 0) == (b < 0) else -q
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format != MONO_VLSB:
+            raise ValueError("only MONO_VLSB is supported")
+        if stride is None:
+            stride = width
+        self._buffer = buffer
+        self._width = width
+        self._height = height
+        self._stride = stride
+        if len(memoryview(buffer)) < ((height + 7) // 8) * stride:
+            raise ValueError("buffer too small")
+
+    def _get(self, x, y):
+        return (self._buffer[(y >> 3) * self._stride + x] >> (y & 7)) & 1
+
+    def _set(self, x, y, c):
+        i = (y >> 3) * self._stride + x
+        if c:
+            self._buffer[i] |= 1 << (y & 7)
+        else:
+            self._buffer[i] &= ~(1 << (y & 7)) & 0xFF
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self._width and 0 <= y < self._height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill(self, c):
+        value = 0xFF if c else 0
+        for i in range(((self._height + 7) // 8) * self._stride):
+            self._buffer[i] = value
+
+    def fill_rect(self, x, y, w, h, c):
+        x0 = max(x, 0)
+        y0 = max(y, 0)
+        x1 = min(x + w, self._width)
+        y1 = min(y + h, self._height)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        FrameBuffer.fill_rect(self, x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        FrameBuffer.fill_rect(self, x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            FrameBuffer.fill_rect(self, x, y, w, h, c)
+            return
+        FrameBuffer.fill_rect(self, x, y, w, 1, c)
+        FrameBuffer.fill_rect(self, x, y + h - 1, w, 1, c)
+        FrameBuffer.fill_rect(self, x, y, 1, h, c)
+        FrameBuffer.fill_rect(self, x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx = x2 - x1
+        sx = 1 if dx > 0 else -1
+        dx = abs(dx)
+        dy = y2 - y1
+        sy = 1 if dy > 0 else -1
+        dy = abs(dy)
+        steep = dy > dx
+        if steep:
+            x1, y1 = y1, x1
+            dx, dy = dy, dx
+            sx, sy = sy, sx
+        e = 2 * dy - dx
+        for _ in range(dx):
+            if steep:
+                FrameBuffer.pixel(self, y1, x1, c)
+            else:
+                FrameBuffer.pixel(self, x1, y1, c)
+            while e >= 0:
+                y1 += sy
+                e -= 2 * dx
+            x1 += sx
+            e += 2 * dy
+        FrameBuffer.pixel(self, x2, y2, c)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0x0F):
+        # m selects quadrants: 1 top right, 2 top left, 4 bottom left,
+        # 8 bottom right
+        m &= 0x0F
+        if xr == 0 and yr == 0:
+            if m:
+                FrameBuffer.pixel(self, x, y, c)
+            return
+
+        def points(px, py):
+            if f:
+                if m & 1:
+                    FrameBuffer.fill_rect(self, x, y - py, px + 1, 1, c)
+                if m & 2:
+                    FrameBuffer.fill_rect(self, x - px, y - py, px + 1, 1, c)
+                if m & 4:
+                    FrameBuffer.fill_rect(self, x - px, y + py, px + 1, 1, c)
+                if m & 8:
+                    FrameBuffer.fill_rect(self, x, y + py, px + 1, 1, c)
+            else:
+                if m & 1:
+                    FrameBuffer.pixel(self, x + px, y - py, c)
+                if m & 2:
+                    FrameBuffer.pixel(self, x - px, y - py, c)
+                if m & 4:
+                    FrameBuffer.pixel(self, x - px, y + py, c)
+                if m & 8:
+                    FrameBuffer.pixel(self, x + px, y + py, c)
+
+        two_a2 = 2 * xr * xr
+        two_b2 = 2 * yr * yr
+        px = xr
+        py = 0
+        xchange = yr * yr * (1 - 2 * xr)
+        ychange = xr * xr
+        error = 0
+        stop_x = two_b2 * xr
+        stop_y = 0
+        while stop_x >= stop_y:
+            points(px, py)
+            py += 1
+            stop_y += two_a2
+            error += ychange
+            ychange += two_a2
+            if 2 * error + xchange > 0:
+                px -= 1
+                stop_x -= two_b2
+                error += xchange
+                xchange += two_b2
+        px = 0
+        py = yr
+        xchange = yr * yr
+        ychange = xr * xr * (1 - 2 * yr)
+        error = 0
+        stop_x = 0
+        stop_y = two_a2 * yr
+        while stop_x <= stop_y:
+            points(px, py)
+            px += 1
+            stop_x += two_b2
+            error += xchange
+            xchange += two_b2
+            if 2 * error + ychange > 0:
+                py -= 1
+                stop_y -= two_a2
+                error += ychange
+                ychange += two_a2
+
+    def poly(self, x, y, coords, c, f=False):
+        n = len(coords) // 2
+        if n < 1:
+            return
+        if not f:
+            px1, py1 = coords[0], coords[1]
+            for i in range(n - 1, -1, -1):
+                px2, py2 = coords[2 * i], coords[2 * i + 1]
+                FrameBuffer.line(self, x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+            return
+        ys = coords[1::2]
+        for row in range(min(ys), max(ys) + 1):
+            nodes = []
+            px1, py1 = coords[0], coords[1]
+            for i in range(n - 1, -1, -1):
+                px2, py2 = coords[2 * i], coords[2 * i + 1]
+                # leave out the bottom pixel of each edge so a vertex isn't
+                # counted twice; local minima are filled in separately
+                if py1 != py2 and ((py1 > row >= py2) or (py1 <= row < py2)):
+                    step = _div(32 * (px2 - px1) * (row - py1), py2 - py1)
+                    nodes.append(_div(32 * px1 + step + 16, 32))
+                elif row == max(py1, py2):
+                    if py1 < py2:
+                        FrameBuffer.pixel(self, x + px2, y + py2, c)
+                    elif py2 < py1:
+                        FrameBuffer.pixel(self, x + px1, y + py1, c)
+                    else:
+                        FrameBuffer.line(self, x + px1, y + py1, x + px2, y + py2, c)
+                px1, py1 = px2, py2
+            nodes.sort()
+            for i in range(0, len(nodes) - 1, 2):
+                FrameBuffer.fill_rect(self, x + nodes[i], y + row, nodes[i + 1] - nodes[i] + 1, 1, c)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if isinstance(fbuf, (tuple, list)):
+            fbuf = FrameBuffer(*fbuf)
+        for sy in range(fbuf._height):
+            yy = y + sy
+            if not 0 <= yy < self._height:
+                continue
+            for sx in range(fbuf._width):
+                xx = x + sx
+                if not 0 <= xx < self._width:
+                    continue
+                c = fbuf._get(sx, sy)
+                if palette is not None:
+                    c = palette.pixel(c, 0)
+                if c != key:
+                    self._set(xx, yy, c)
+
+    def scroll(self, xstep, ystep):
+        if xstep < 0:
+            sx, xend, dx = 0, self._width + xstep, 1
+            if xend <= 0:
+                return
+        else:
+            sx, xend, dx = self._width - 1, xstep - 1, -1
+            if xend >= sx:
+                return
+        if ystep < 0:
+            y, yend, dy = 0, self._height + ystep, 1
+            if yend <= 0:
+                return
+        else:
+            y, yend, dy = self._height - 1, ystep - 1, -1
+            if yend >= y:
+                return
+        while y != yend:
+            x = sx
+            while x != xend:
+                self._set(x, y, self._get(x - xstep, y - ystep))
+                x += dx
+            y += dy
+
+    def text(self, s, x, y, c=1):
+        # The built-in 8x8 font isn't included, so this draws nothing. Code
+        # calling text() still runs, and the area is still marked as drawn.
+        pass
@@ -0,0 +1,56 @@
+# Glyphs of the original ssd1306big.py, drawn with its line() calls at the
+# native size: MONO_VLSB, 3 pages of 11 columns each. host/check_driver.py
+# checks the module still draws exactly these.
+
+WIDTH = 11
+HEIGHT = 18
+
+GLYPHS = {
+    "A": b"\x00\x00\x00\x80\x78\x06\x38\xc0\x00\x00\x00\x00\xc0\x3c\x0b\x08\x08\x08\x08\x0f\x38\xc0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "B": b"\x00\xfe\x82\x82\x82\x82\x82\x64\x18\x00\x00\x00\xff\x80\x80\x80\x80\x80\x41\x22\x1c\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "C": b"\x00\xe0\x18\x04\x02\x02\x02\x02\x02\x02\x04\x00\x1f\x20\x40\x80\x80\x80\x80\x80\x40\x20\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "D": b"\x00\xfe\x02\x02\x02\x02\x02\x04\x04\xf8\x00\x00\xff\x80\x80\x80\x80\x80\x40\x20\x1f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "E": b"\x00\xfe\x82\x82\x82\x82\x82\x82\x02\x02\x00\x00\xff\x80\x80\x80\x80\x80\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "F": b"\x00\xfe\x82\x82\x82\x82\x82\x02\x02\x02\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "G": b"\x00\xe0\x18\x04\x02\x02\x02\x02\x02\x04\x00\x00\x1f\x20\x40\x80\x80\x82\x82\x82\x42\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "H": b"\x00\xfe\x80\x80\x80\x80\x80\x80\x80\xfe\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "I": b"\x00\x02\x02\x02\x02\xfe\x02\x02\x02\x02\x00\x00\x80\x80\x80\x80\xff\x80\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "J": b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\xfe\x00\x00\x0c\x30\xc0\x80\x80\x80\xc0\x30\x0f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "K": b"\x00\xfe\x00\x80\xc0\x30\x08\x04\x02\x00\x00\x00\xff\x01\x00\x00\x03\x04\x18\x60\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "L": b"\x00\xfe\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\x80\x80\x80\x80\x80\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "M": b"\x00\xfe\x0c\x10\x60\x80\x60\x10\x0c\xfe\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "N": b"\x00\xfe\x0c\x30\xc0\x00\x00\x00\x00\xfe\x00\x00\xff\x00\x00\x00\x01\x06\x18\x60\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "O": b"\x00\xe0\x18\x04\x02\x02\x02\x02\x06\x18\xe0\x00\x1f\x20\x40\x80\x80\x80\x80\x40\x20\x1f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "P": b"\x00\xfe\x02\x02\x02\x02\x02\x02\x8c\x70\x00\x00\xff\x02\x02\x02\x02\x02\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "Q": b"\x00\xe0\x18\x04\x02\x02\x02\x02\x06\x18\xe0\x00\x1f\x20\x40\x80\x80\x84\x88\x70\x60\x9f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "R": b"\x00\xfe\x02\x02\x02\x02\x02\x02\x8c\x70\x00\x00\xff\x02\x02\x02\x02\x0e\x11\x60\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "S": b"\x00\x30\x4c\x42\x82\x82\x82\x02\x02\x04\x00\x00\x20\x40\x40\x80\x80\x80\x81\x41\x43\x3c\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "T": b"\x00\x02\x02\x02\x02\xfe\x02\x02\x02\x02\x00\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "U": b"\x00\xfe\x00\x00\x00\x00\x00\x00\x00\xfe\x00\x00\x3f\x40\x80\x80\x80\x80\x80\x40\x3f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "V": b"\x00\x06\x78\x80\x00\x00\x00\x80\x78\x06\x00\x00\x00\x00\x03\x3c\xc0\x3c\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "W": b"\x00\x1e\xe0\x00\x00\x00\x00\x00\x00\xe0\x1e\x00\x00\x0f\xf0\x3c\x03\x0c\x30\xf0\x0f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "X": b"\x00\x02\x0c\x30\xc0\x00\xc0\x30\x0c\x02\x00\x00\x80\x60\x18\x06\x01\x06\x18\x60\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "Y": b"\x00\x02\x0c\x10\x60\x80\x40\x20\x18\x04\x02\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "Z": b"\x00\x02\x02\x02\x02\x02\xc2\x32\x0e\x02\x00\x00\x80\xe0\x98\x86\x81\x80\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "0": b"\x00\xe0\x18\x04\x02\x02\x82\x42\x26\x18\xe0\x00\x1f\x30\x48\x84\x83\x80\x80\x40\x20\x1f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "1": b"\x00\x00\x08\x04\x04\xfe\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "2": b"\x00\x08\x06\x02\x02\x02\x02\x02\x84\x78\x00\x00\xc0\xa0\x90\x88\x84\x82\x81\x80\x80\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "3": b"\x00\x08\x06\x02\x82\x82\x82\x82\x44\x38\x00\x00\x20\x40\x80\x80\x80\x80\x81\x62\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "4": b"\x00\xfe\x80\x80\x80\x80\x80\x80\xfe\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\xff\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "5": b"\x00\xfe\x82\x82\x82\x82\x82\x82\x02\x02\x00\x00\x20\x40\x80\x80\x80\x80\x81\x62\x1e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "6": b"\x00\xe0\x18\x04\x82\x82\x82\x82\x82\x04\x08\x00\x1f\x22\x41\x80\x80\x80\x80\x40\x41\x3e\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "7": b"\x00\x02\x02\x02\x02\x02\x02\xc2\x32\x0e\x02\x00\x00\x00\xc0\x30\x0c\x03\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "8": b"\x00\x00\x38\x44\x82\x82\x82\x44\x38\x00\x00\x00\x3c\x42\x81\x80\x80\x80\x81\x42\x3c\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "9": b"\x00\x38\xc4\x02\x02\x02\x02\x02\x02\x84\xf8\x00\x20\x40\x81\x81\x81\x81\x81\x41\x30\x0f\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    ".": b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc0\xc0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "!": b"\x00\xfe\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc7\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "?": b"\x00\x00\x00\x00\x02\x02\x82\x82\x62\x1c\x00\x00\x00\x00\x00\x00\xc7\xc0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "/": b"\x00\x00\x00\x00\x00\x00\xc0\x30\x0c\x02\x00\x00\x80\x60\x18\x06\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    ":": b"\x00\x60\x60\x00\x00\x00\x00\x00\x00\x00\x00\x00\xc0\xc0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    ",": b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x60\xe0\x00\x00\x00\x00\x00\x00\x00\x00\x00\x02\x03\x00\x00\x00\x00\x00\x00\x00\x00",
+    "&": b"\x00\x00\x38\x44\x82\x82\x42\x24\x18\x00\x00\x00\x3c\x42\x81\x81\x82\x84\x78\x38\x46\x80\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "+": b"\x00\x00\x00\x00\x00\xe0\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x0f\x01\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "-": b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x01\x01\x01\x01\x01\x01\x01\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    "=": b"\x00\x00\x40\x40\x40\x40\x40\x40\x40\x00\x00\x00\x00\x02\x02\x02\x02\x02\x02\x02\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+    " ": b"\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00\x00",
+}
@@ -0,0 +1,26 @@
+# Stand-in for MicroPython's machine module, for running on CPython.
+#
+# I2C buses come with an emulated 128x64 SSD1306 at address 0x3C and SPI
+# buses with one behind their own dc/cs Pins, see ssd1306emu.
+
+from ssd1306emu import Bus, Pin, SPI as _SPI
+
+
+class I2C(Bus):
+    def __init__(self, id=0, scl=None, sda=None, freq=400000, panels=None):
+        super().__init__(panels)
+        self.id = id
+        self.freq = freq
+
+
+SoftI2C = I2C
+
+
+class SPI(_SPI):
+    def __init__(self, id=0, baudrate=1000000, polarity=0, phase=0, sck=None, mosi=None, miso=None, panel=None):
+        super().__init__(panel)
+        self.id = id
+        self.baudrate = baudrate
+
+
+SoftSPI = SPI
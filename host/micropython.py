@@ -0,0 +1,13 @@
+# Stand-in for MicroPython's micropython module, for running on CPython.
+
+
+def const(x):
+    return x
+
+
+def native(f):
+    return f
+
+
+def viper(f):
+    return f
@@ -0,0 +1,412 @@
+# Emulated SSD1306 panels for running ssd1306big on CPython.
+#
+# Panel models the controller: it parses the same control, command and data
+# bytes SSD1306_I2C puts on the wire, keeps its own 128x64 display RAM and
+# follows the column/page address windows, so what ends up in Panel.ram is
+# exactly what a real panel would show. Bus stands in for machine.I2C and
+# hands each transfer to the panel at the addressed slave address; SPI and
+# Pin do the same for SSD1306_SPI.
+#
+#     import sys
+#     sys.path.insert(0, "host")
+#     import ssd1306big, ssd1306emu
+#
+#     screen, panel = ssd1306emu.emulated()
+#     ssd1306big.use(screen)
+#     ssd1306big.wrap("HELLO WORLD")
+#     ssd1306emu.check(screen)        # panel RAM == framebuffer
+#     panel.save_png("hello.png")
+
+import struct
+import zlib
+
+# number of argument bytes following each command that takes any
+ARGUMENTS = {
+    0x20: 1,  # memory addressing mode
+    0x21: 2,  # column address
+    0x22: 2,  # page address
+    0x26: 6,  # right horizontal scroll setup
+    0x27: 6,  # left horizontal scroll setup
+    0x29: 5,  # vertical and right horizontal scroll setup
+    0x2A: 5,  # vertical and left horizontal scroll setup
+    0x81: 1,  # contrast
+    0x8D: 1,  # charge pump
+    0xA3: 2,  # vertical scroll area
+    0xA8: 1,  # multiplex ratio
+    0xAD: 1,  # internal IREF (some clones)
+    0xD3: 1,  # display offset
+    0xD5: 1,  # clock divide
+    0xD9: 1,  # precharge
+    0xDA: 1,  # COM pins configuration
+    0xDB: 1,  # VCOMH deselect level
+}
+
+# first visible RAM column of panels narrower than 128, as in ssd1306big
+OFFSETS = {64: 32, 72: 28}
+
+HORIZONTAL = 0
+VERTICAL = 1
+PAGE = 2
+
+
+class Panel:
+    def __init__(self, width=128, height=64, offset=None):
+        # width and height of the glass; offset is the first RAM column that
+        # is visible, by default the one the driver assumes for that width
+        self.width = width
+        self.height = height
+        if offset is None:
+            offset = OFFSETS.get(width, 0)
+        self.offset = offset
+        self.ram = bytearray(128 * 8)
+        self.on = False
+        self.inverted = False
+        self.contrast = 0x7F
+        self.mode = PAGE
+        self.col_start = 0
+        self.col_end = 127
+        self.page_start = 0
+        self.page_end = 7
+        self.col = 0
+        self.page = 0
+        self.seg_remap = False
+        self.com_reversed = False
+        self.start_line = 0
+        self.scrolling = False
+        self.scroll_setup = None
+        self.commands = []
+        self._command = None
+        self._needed = 0
+        # wire counters
+        self.transactions = 0
+        self.bytes = 0
+        self.data_bytes = 0
+
+    # --- wire protocol
+
+    def receive(self, buf):
+        # one I2C write transaction addressed to this panel
+        self.transactions += 1
+        self.bytes += len(buf)
+        i = 0
+        while i < len(buf):
+            control = buf[i]
+            i += 1
+            write = self.data if control & 0x40 else self.command
+            if control & 0x80:
+                # Co=1: one byte, then another control byte
+                if i < len(buf):
+                    write(buf[i])
+                    i += 1
+            else:
+                # Co=0: the rest of the transaction is all data or all commands
+                for byte in buf[i:]:
+                    write(byte)
+                break
+
+    def command(self, byte):
+        if self._needed:
+            self._command.append(byte)
+            self._needed -= 1
+            if not self._needed:
+                self.execute(self._command)
+            return
+        self._command = [byte]
+        self._needed = ARGUMENTS.get(byte, 0)
+        if not self._needed:
+            self.execute(self._command)
+
+    def execute(self, cmd):
+        self.commands.append(tuple(cmd))
+        op = cmd[0]
+        if op == 0x20:
+            self.mode = cmd[1] & 3
+        elif op == 0x21:
+            self.col_start = cmd[1] & 0x7F
+            self.col_end = cmd[2] & 0x7F
+            self.col = self.col_start
+        elif op == 0x22:
+            self.page_start = cmd[1] & 7
+            self.page_end = cmd[2] & 7
+            self.page = self.page_start
+        elif 0xB0 <= op <= 0xB7:
+            self.page = op & 7
+        elif op <= 0x0F:
+            self.col = (self.col & 0xF0) | op
+        elif op <= 0x1F:
+            self.col = (self.col & 0x0F) | ((op & 0x07) << 4)
+        elif 0x40 <= op <= 0x7F:
+            self.start_line = op & 0x3F
+        elif op == 0x81:
+            self.contrast = cmd[1]
+        elif op in (0xA0, 0xA1):
+            self.seg_remap = bool(op & 1)
+        elif op in (0xA6, 0xA7):
+            self.inverted = bool(op & 1)
+        elif op in (0xAE, 0xAF):
+            self.on = bool(op & 1)
+        elif op in (0xC0, 0xC8):
+            self.com_reversed = bool(op & 8)
+        elif op in (0x26, 0x27, 0x29, 0x2A):
+            self.scroll_setup = tuple(cmd)
+        elif op == 0x2F:
+            self.scrolling = True
+        elif op == 0x2E:
+            self.scrolling = False
+
+    def data(self, byte):
+        self.ram[self.page * 128 + self.col] = byte
+        self.data_bytes += 1
+        if self.mode == HORIZONTAL:
+            self.col += 1
+            if self.col > self.col_end:
+                self.col = self.col_start
+                self.page += 1
+                if self.page > self.page_end:
+                    self.page = self.page_start
+        elif self.mode == VERTICAL:
+            self.page += 1
+            if self.page > self.page_end:
+                self.page = self.page_start
+                self.col += 1
+                if self.col > self.col_end:
+                    self.col = self.col_start
+        else:
+            self.col = (self.col + 1) & 0x7F
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.data_bytes = 0
+
+    # --- what the panel shows
+
+    def visible(self):
+        # the RAM bytes behind the glass, in the driver's buffer layout
+        out = bytearray()
+        for page in range(self.height // 8):
+            start = page * 128 + self.offset
+            out += self.ram[start:start + self.width]
+        return bytes(out)
+
+    def pixel(self, x, y):
+        # lit state of the pixel at x, y as seen by the viewer
+        if not self.on:
+            return 0
+        col = x + self.offset
+        if not self.seg_remap:
+            col = 127 - col
+        row = y if self.com_reversed else self.height - 1 - y
+        row = (row + self.start_line) & 63
+        lit = (self.ram[(row >> 3) * 128 + col] >> (row & 7)) & 1
+        return lit ^ self.inverted
+
+    def rows(self, scale=1):
+        for y in range(self.height):
+            row = [self.pixel(x, y) for x in range(self.width) for _ in range(scale)]
+            for _ in range(scale):
+                yield row
+
+    def pbm(self, scale=1):
+        # binary PBM, 1 is black, so lit pixels are written as 0
+        width = self.width * scale
+        out = bytearray(b"P4\n%d %d\n" % (width, self.height * scale))
+        for row in self.rows(scale):
+            for x in range(0, width, 8):
+                byte = 0
+                for bit in range(8):
+                    if x + bit < width and not row[x + bit]:
+                        byte |= 0x80 >> bit
+                out.append(byte)
+        return bytes(out)
+
+    def png(self, scale=1):
+        # 1 bit greyscale PNG, lit pixels white
+        width = self.width * scale
+        raw = bytearray()
+        for row in self.rows(scale):
+            raw.append(0)
+            for x in range(0, width, 8):
+                byte = 0
+                for bit in range(8):
+                    if x + bit < width and row[x + bit]:
+                        byte |= 0x80 >> bit
+                raw.append(byte)
+
+        def chunk(kind, data):
+            return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+
+        header = struct.pack(">IIBBBBB", width, self.height * scale, 1, 0, 0, 0, 0)
+        return (b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) +
+                chunk(b"IDAT", zlib.compress(bytes(raw))) + chunk(b"IEND", b""))
+
+    def save_pbm(self, path, scale=1):
+        with open(path, "wb") as f:
+            f.write(self.pbm(scale))
+
+    def save_png(self, path, scale=1):
+        with open(path, "wb") as f:
+            f.write(self.png(scale))
+
+    def ascii(self):
+        return "\n".join("".join("#" if self.pixel(x, y) else "." for x in range(self.width))
+                         for y in range(self.height))
+
+
+class Bus:
+    # stand-in for machine.I2C with panels attached at slave addresses
+    def __init__(self, panels=None):
+        # panels maps slave addresses to Panels; by default a 128x64 panel
+        # answers at 0x3C
+        if panels is None:
+            panels = {0x3C: Panel()}
+        self.panels = panels
+        self.transactions = 0
+        self.bytes = 0
+
+    def attach(self, addr, panel):
+        self.panels[addr] = panel
+        return panel
+
+    def scan(self):
+        return sorted(self.panels)
+
+    def _panel(self, addr):
+        try:
+            return self.panels[addr]
+        except KeyError:
+            raise OSError(19)  # ENODEV, like a NAK on real hardware
+
+    def writeto(self, addr, buf, stop=True):
+        panel = self._panel(addr)
+        buf = bytes(buf)
+        self.transactions += 1
+        self.bytes += len(buf)
+        panel.receive(buf)
+        return 1
+
+    def writevto(self, addr, vector, stop=True):
+        panel = self._panel(addr)
+        buf = b"".join(bytes(part) for part in vector)
+        self.transactions += 1
+        self.bytes += len(buf)
+        panel.receive(buf)
+        return 1
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0
+        for panel in self.panels.values():
+            panel.reset_counters()
+
+
+class Pin:
+    # stand-in for machine.Pin, an output that remembers its level
+    OUT = 1
+    IN = 0
+
+    def __init__(self, id=None, mode=OUT, value=0):
+        self.id = id
+        self.level = value
+
+    def init(self, mode=OUT, value=None):
+        if value is not None:
+            self.level = value
+
+    def value(self, level=None):
+        if level is None:
+            return self.level
+        self.level = level
+
+    __call__ = value
+
+
+class SPI:
+    # stand-in for machine.SPI wired to one panel through the dc and cs Pins
+    # it makes; the panel takes bytes while cs is low, as commands when dc
+    # is low and as data when it is high
+    def __init__(self, panel=None):
+        if panel is None:
+            panel = Panel()
+        self.panel = panel
+        self.dc = Pin()
+        self.cs = Pin(value=1)
+        self.res = Pin()
+        self.baudrate = 0
+        self.transactions = 0
+        self.bytes = 0
+
+    def init(self, baudrate=1000000, polarity=0, phase=0, **kw):
+        self.baudrate = baudrate
+
+    def write(self, buf):
+        if self.cs():
+            return
+        panel = self.panel
+        write = panel.data if self.dc() else panel.command
+        self.transactions += 1
+        self.bytes += len(buf)
+        panel.transactions += 1
+        panel.bytes += len(buf)
+        for byte in bytes(buf):
+            write(byte)
+
+    def reset_counters(self):
+        self.transactions = 0
+        self.bytes = 0
+        self.panel.reset_counters()
+
+
+def emulated_spi(width=128, height=64, **kw):
+    # an SSD1306_SPI driving an emulated panel; returns (display, panel)
+    import ssd1306big
+
+    spi = SPI(Panel(width, height))
+    return ssd1306big.SSD1306_SPI(width, height, spi, spi.dc, spi.res, spi.cs, **kw), spi.panel
+
+
+def emulated(width=128, height=64, addr=0x3C, bus=None, **kw):
+    # an SSD1306_I2C driving an emulated panel; returns (display, panel)
+    import ssd1306big
+
+    if bus is None:
+        bus = Bus({})
+    panel = bus.attach(addr, Panel(width, height))
+    return ssd1306big.SSD1306_I2C(width, height, bus, addr, **kw), panel
+
+
+def check(display, panel=None):
+    # raise AssertionError unless the panel shows exactly display.buffer
+    if panel is None:
+        if hasattr(display, "spi"):
+            panel = display.spi.panel
+        else:
+            panel = display.i2c.panels[display.addr]
+    shown = panel.visible()
+    if shown == bytes(display.buffer):
+        return
+    for i in range(len(shown)):
+        if shown[i] != display.buffer[i]:
+            page, col = divmod(i, display.width)
+            raise AssertionError("panel differs from framebuffer at page %d column %d: %02x != %02x"
+                                 % (page, col, shown[i], display.buffer[i]))
+
+
+if __name__ == "__main__":
+    # render the whole font, check the panel against the framebuffer and
+    # write a snapshot
+    import os
+    import sys
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+    import ssd1306big
+
+    screen, panel = emulated()
+    ssd1306big.use(screen)
+    for text in ("ABCDEFGHIJKLMNOPQRSTUVWX", "YZ0123456789.!?/:,&+-= "):
+        ssd1306big.clear()
+        ssd1306big.flow(text)
+        check(screen, panel)
+    path = sys.argv[1] if len(sys.argv) > 1 else "ssd1306emu.png"
+    panel.save_png(path, 4)
+    print("ok, %d transactions, %d bytes, snapshot in %s" % (panel.transactions, panel.bytes, path))
@@ -11,12 +11,43 @@
 
 
 
-import machine
 import time
 
-from micropython import const
+try:
+    from time import ticks_ms, ticks_us, ticks_diff, sleep_ms
+except ImportError:
+    # CPython
+    def ticks_ms():
+        return int(time.monotonic() * 1000)
+
+    def ticks_us():
+        return int(time.perf_counter() * 1000000)
+
+    def ticks_diff(a, b):
+        return a - b
+
+    def sleep_ms(ms):
+        time.sleep(ms / 1000)
+
+try:
+    from micropython import const
+except ImportError:
+    def const(x):
+        return x
 import framebuf
 
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ucollections import OrderedDict
+
+try:
+    # glyph bitmaps generated by tools/compile_font.py; when the module is
+    # frozen into the firmware they are read straight from flash
+    import ssd1306big_font as frozenFont
+except ImportError:
+    frozenFont = None
+
 
 # register definitions
 SET_CONTRAST = const(0x81)
@@ -36,21 +67,65 @@ SET_DISP_CLK_DIV = const(0xD5)
 SET_PRECHARGE = const(0xD9)
 SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
+SET_HSCROLL = const(0x26)  # | 1 for left
+SET_SCROLL_OFF = const(0x2E)
+SET_SCROLL_ON = const(0x2F)
+
+SET_IREF = const(0xAD)
+
+# columns per view of the buffer windows are streamed from when chunked()
+# isn't limiting the transfer size
+VIEW_WIDTH = const(8)
+
+# panels narrower than the controller's 128 columns are wired to the middle
+# of its RAM; sizes not listed start at column 0. Tested sizes are 128x64,
+# 128x32, 96x16, 72x40 and 64x48.
+COLUMN_OFFSETS = {64: 32, 72: 28}
+
+# hardware scroll step intervals in frames, indexed by their 3 bit code
+SCROLL_FRAMES = (5, 64, 128, 256, 3, 4, 25, 2)
 
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, double_buffer=False):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
         self.pages = self.height // 8
+        # first controller column wired to the glass
+        self.offset = COLUMN_OFFSETS.get(width, 0)
         self.buffer = bytearray(self.pages * self.width)
+        self.view = memoryview(self.buffer)
+        # per page, the first and one-past-last column touched since the last
+        # show(); dirty_x1 == 0 means the page is clean
+        self.dirty_x0 = bytearray(self.pages)
+        self.dirty_x1 = bytearray(self.pages)
+        # with double_buffer, a copy of what the panel is showing; show() sends
+        # whatever differs from it, however it was drawn
+        self.shadow = bytearray(len(self.buffer)) if double_buffer else None
+        self.synced = False
+        # next page step_diff() looks at
+        self.cursor = 0
+        # pages under hardware scroll, see hscroll()
+        self.scrolled = None
+        # SET_COL_ADDR x0 x1 SET_PAGE_ADDR page0 page1, reused by every window
+        self.window = bytearray((SET_COL_ADDR, 0, 0, SET_PAGE_ADDR, 0, 0))
+        # send all dirty pages as one window, see step()
+        self.burst = False
+        # views of the buffer windows are streamed from, see chunked()
+        self.chunked(0)
+        # called with the display after each frame has been sent, see stats()
+        self.on_frame = None
+        # (displayArray, lineArrays) the text functions use on this display,
+        # per scale, see use()
+        self.grids = {}
+        self.reset_stats()
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
     def init_display(self):
-        for cmd in (
+        self.write_cmds(bytes((
             SET_DISP | 0x00,  # off
             # address setting
             SET_MEM_ADDR,
@@ -80,9 +155,11 @@ class SSD1306(framebuf.FrameBuffer):
             # charge pump
             SET_CHARGE_PUMP,
             0x10 if self.external_vcc else 0x14,
-            SET_DISP | 0x01,
-        ):  # on
-            self.write_cmd(cmd)
+            SET_DISP | 0x01,  # on
+        )))
+        if self.width == 72:
+            # 72x40 glass needs the internal current reference
+            self.write_cmds(bytes((SET_IREF, 0x30)))
         self.fill(0)
         self.show()
 
@@ -93,647 +170,1546 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_DISP | 0x01)
 
     def contrast(self, contrast):
-        self.write_cmd(SET_CONTRAST)
-        self.write_cmd(contrast)
+        self.write_cmds(bytes((SET_CONTRAST, contrast)))
 
     def invert(self, invert):
         self.write_cmd(SET_NORM_INV | (invert & 1))
 
+    def hscroll(self, page0, page1, left=True, frames=5):
+        # let the controller scroll pages page0..page1 sideways on its own,
+        # one column every `frames` frames (the nearest of SCROLL_FRAMES)
+        code = 0
+        for i in range(len(SCROLL_FRAMES)):
+            if abs(SCROLL_FRAMES[i] - frames) < abs(SCROLL_FRAMES[code] - frames):
+                code = i
+        self.write_cmds(bytes((
+            SET_SCROLL_OFF,
+            SET_HSCROLL | (1 if left else 0),
+            0x00,
+            page0,
+            code,
+            page1,
+            0x00,
+            0xFF,
+            SET_SCROLL_ON,
+        )))
+        self.scrolled = (page0, page1)
+
+    def stop_scroll(self):
+        # the controller leaves scrolled pages shifted in its RAM, so they
+        # are sent again on the next show()
+        self.write_cmds(bytes((SET_SCROLL_OFF,)))
+        if self.scrolled is not None:
+            page0, page1 = self.scrolled
+            self.scrolled = None
+            self.mark(0, page0 * 8, self.width, (page1 - page0 + 1) * 8)
+            if self.shadow is not None:
+                for i in range(page0 * self.width, (page1 + 1) * self.width):
+                    self.shadow[i] = ~self.buffer[i] & 0xFF
+
+    def write_cmds(self, cmds):
+        # send a sequence of commands; transports override this to send them
+        # in one transfer
+        for cmd in cmds:
+            self.write_cmd(cmd)
+
+    def chunked(self, size):
+        # Stream windows in transfers of at most size bytes, for controllers
+        # with small transfer buffers, or 0 for one transfer per window.
+        # The views sent are cut out of the buffer once, here, VIEW_WIDTH
+        # columns each when size is 0, so sending allocates nothing; windows
+        # are widened to whole views for that.
+        self.chunk = size
+        size = size or VIEW_WIDTH
+        width = self.width
+        self.chunks = [self.view[start + x:start + min(x + size, width)]
+                       for start in range(0, len(self.buffer), width)
+                       for x in range(0, width, size)]
+
+    def mark(self, x, y, w, h):
+        # record that the rectangle x, y, w, h has to be sent on the next show()
+        if x < 0:
+            w += x
+            x = 0
+        if y < 0:
+            h += y
+            y = 0
+        if x + w > self.width:
+            w = self.width - x
+        if y + h > self.height:
+            h = self.height - y
+        if w <= 0 or h <= 0:
+            return
+        x1 = x + w
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        for page in range(y >> 3, ((y + h - 1) >> 3) + 1):
+            if dirty_x1[page]:
+                if x < dirty_x0[page]:
+                    dirty_x0[page] = x
+                if x1 > dirty_x1[page]:
+                    dirty_x1[page] = x1
+            else:
+                dirty_x0[page] = x
+                dirty_x1[page] = x1
+
+    def invalidate(self):
+        # force the whole buffer out on the next show(), e.g. after writing
+        # to self.buffer directly or after the panel lost its contents
+        self.mark(0, 0, self.width, self.height)
+        self.synced = False
+
+    # FrameBuffer drawing primitives, routed through the dirty tracking
+    def fill(self, c):
+        super().fill(c)
+        self.mark(0, 0, self.width, self.height)
+
+    def pixel(self, x, y, *c):
+        if not c:
+            return super().pixel(x, y)
+        super().pixel(x, y, c[0])
+        self.mark(x, y, 1, 1)
+
+    def hline(self, x, y, w, c):
+        super().hline(x, y, w, c)
+        self.mark(x, y, w, 1)
+
+    def vline(self, x, y, h, c):
+        super().vline(x, y, h, c)
+        self.mark(x, y, 1, h)
+
+    def line(self, x1, y1, x2, y2, c):
+        super().line(x1, y1, x2, y2, c)
+        if x1 > x2:
+            x1, x2 = x2, x1
+        if y1 > y2:
+            y1, y2 = y2, y1
+        self.mark(x1, y1, x2 - x1 + 1, y2 - y1 + 1)
+
+    def rect(self, x, y, w, h, c, *f):
+        super().rect(x, y, w, h, c, *f)
+        self.mark(x, y, w, h)
+
+    def fill_rect(self, x, y, w, h, c):
+        super().fill_rect(x, y, w, h, c)
+        self.mark(x, y, w, h)
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0x0F):
+        super().ellipse(x, y, xr, yr, c, f, m)
+        self.mark(x - xr, y - yr, 2 * xr + 1, 2 * yr + 1)
+
+    def poly(self, x, y, coords, c, f=False):
+        super().poly(x, y, coords, c, f)
+        if not len(coords):
+            return
+        x0 = x1 = coords[0]
+        y0 = y1 = coords[1]
+        for i in range(2, len(coords) - 1, 2):
+            px = coords[i]
+            py = coords[i + 1]
+            if px < x0:
+                x0 = px
+            elif px > x1:
+                x1 = px
+            if py < y0:
+                y0 = py
+            elif py > y1:
+                y1 = py
+        self.mark(x + x0, y + y0, x1 - x0 + 1, y1 - y0 + 1)
+
+    def text(self, s, x, y, c=1):
+        super().text(s, x, y, c)
+        self.mark(x, y, 8 * len(s), 8)
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        # no *args: that would allocate a tuple for every glyph drawn
+        if palette is None:
+            super().blit(fbuf, x, y, key)
+        else:
+            super().blit(fbuf, x, y, key, palette)
+        # type() rather than isinstance(fbuf, (tuple, list)), which builds a
+        # tuple on every call
+        if type(fbuf) is tuple or type(fbuf) is list:
+            self.mark(x, y, fbuf[1], fbuf[2])
+        elif hasattr(fbuf, "width"):
+            self.mark(x, y, fbuf.width, fbuf.height)
+        else:
+            # plain FrameBuffers don't expose their size
+            self.mark(x, y, self.width, self.height)
+
+    def scroll(self, xstep, ystep):
+        super().scroll(xstep, ystep)
+        self.mark(0, 0, self.width, self.height)
+
+    def reset_stats(self):
+        self.frames = 0
+        self.windows = 0
+        self.transactions = 0
+        self.bytes = 0
+        self.send_us = 0
+        self.text_calls = 0
+        self.text_us = 0
+        # windows sent since the end of the last frame
+        self.frame_windows = 0
+
+    def stats(self):
+        # Totals since the last reset_stats(): frames (show()s that sent
+        # anything), windows, bus transactions and bytes (control bytes
+        # included), time spent sending, and the calls to and time spent in
+        # the text functions, sending included. Times are in units of clock.
+        return {
+            "frames": self.frames,
+            "windows": self.windows,
+            "transactions": self.transactions,
+            "bytes": self.bytes,
+            "send_us": self.send_us,
+            "text_calls": self.text_calls,
+            "text_us": self.text_us,
+        }
+
+    def write_window(self, x0, x1, page0, page1):
+        # send columns x0..x1-1 of pages page0..page1, timed for stats()
+        start = clock()
+        self.send_window(x0, x1, page0, page1)
+        self.send_us += ticks_diff(clock(), start)
+        self.windows += 1
+        self.frame_windows += 1
+
+    def send_window(self, x0, x1, page0, page1):
+        # the window is widened to whole views, then sent a view per transfer
+        # when chunked() limits the size, or all of them in one otherwise
+        size = self.chunk or VIEW_WIDTH
+        k0 = x0 // size
+        k1 = (x1 + size - 1) // size
+        offset = self.offset
+        window = self.window
+        window[1] = k0 * size + offset
+        window[2] = min(k1 * size, self.width) - 1 + offset
+        window[4] = page0
+        window[5] = page1
+        self.write_cmds(window)
+        chunks = self.chunks
+        per_page = len(chunks) // self.pages
+        if not self.chunk:
+            self.write_views(k0, k1, page0, page1, per_page)
+            return
+        for page in range(page0, page1 + 1):
+            for k in range(page * per_page + k0, page * per_page + k1):
+                self.write_data(chunks[k])
+
+    def write_views(self, k0, k1, page0, page1, per_page):
+        # send views k0..k1-1 of pages page0..page1 as one transfer;
+        # transports override this, this fallback sends them one by one
+        for page in range(page0, page1 + 1):
+            for k in range(page * per_page + k0, page * per_page + k1):
+                self.write_data(self.chunks[k])
+
     def show(self):
-        x0 = 0
-        x1 = self.width - 1
-        if self.width == 64:
-            # displays with width of 64 pixels are shifted by 32
-            x0 += 32
-            x1 += 32
-        self.write_cmd(SET_COL_ADDR)
-        self.write_cmd(x0)
-        self.write_cmd(x1)
-        self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        while self.step():
+            pass
+
+    def step(self):
+        # send the next window of pending changes; returns False once there
+        # is nothing left. show() calls it until then, async code can yield
+        # in between.
+        if self.shadow is not None:
+            sent = self.step_diff()
+        else:
+            sent = self.step_dirty()
+        if not sent and self.frame_windows:
+            self.frame_windows = 0
+            self.frames += 1
+            if self.on_frame is not None:
+                self.on_frame(self)
+        return sent
+
+    def step_dirty(self):
+        width = self.width
+        dirty_x0 = self.dirty_x0
+        dirty_x1 = self.dirty_x1
+        if self.burst:
+            # on a fast bus the bytes cost less than the windows: send every
+            # page from the first dirty one to the last in one full width window
+            first = -1
+            for page in range(self.pages):
+                if dirty_x1[page]:
+                    if first < 0:
+                        first = page
+                        x0 = dirty_x0[page]
+                        x1 = dirty_x1[page]
+                    last = page
+                    dirty_x1[page] = 0
+            if first < 0:
+                return False
+            if first == last:
+                self.write_window(x0, x1, first, first)
+            else:
+                self.write_window(0, width, first, last)
+            return True
+        # send only the dirty column range of each page; runs of fully dirty
+        # pages are merged into one window
+        for page in range(self.pages):
+            x1 = dirty_x1[page]
+            if not x1:
+                continue
+            x0 = dirty_x0[page]
+            dirty_x1[page] = 0
+            end = page
+            if x0 == 0 and x1 == width:
+                while end + 1 < self.pages and dirty_x0[end + 1] == 0 and dirty_x1[end + 1] == width:
+                    end += 1
+                    dirty_x1[end] = 0
+            self.write_window(x0, x1, page, end)
+            return True
+        return False
+
+    def step_diff(self):
+        # compare the next page with the shadow copy and send the span between
+        # the first and last changed column
+        width = self.width
+        buf = self.buffer
+        shadow = self.shadow
+        if not self.synced:
+            for page in range(self.pages):
+                self.dirty_x1[page] = 0
+            shadow[:] = buf
+            self.synced = True
+            self.cursor = 0
+            self.write_window(0, width, 0, self.pages - 1)
+            return True
+        while self.cursor < self.pages:
+            page = self.cursor
+            self.cursor += 1
+            self.dirty_x1[page] = 0
+            start = page * width
+            end = start + width
+            x0 = start
+            while x0 < end and buf[x0] == shadow[x0]:
+                x0 += 1
+            if x0 == end:
+                continue
+            x1 = end
+            while buf[x1 - 1] == shadow[x1 - 1]:
+                x1 -= 1
+            # a loop rather than a slice, which would allocate a view
+            for i in range(x0, x1):
+                shadow[i] = buf[i]
+            self.write_window(x0 - start, x1 - start, page, page)
+            return True
+        self.cursor = 0
+        return False
 
 
 class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False, double_buffer=False):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(width, height, external_vcc)
+        self.cmd_list = [b"\x00", None]  # Co=0, D/C#=0
+        super().__init__(width, height, external_vcc, double_buffer)
+
+    def chunked(self, size):
+        super().chunked(size)
+        # the data control byte, then room for every view; slots not in use
+        # hold an empty buffer, which writevto() skips
+        self.view_list = [b"\x40"] + [b""] * len(self.chunks)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
         self.temp[1] = cmd
         self.i2c.writeto(self.addr, self.temp)
+        self.transactions += 1
+        self.bytes += 2
+
+    def write_cmds(self, cmds):
+        # a single control byte with Co=0 makes every following byte a
+        # command, so the whole sequence goes in one transaction
+        self.cmd_list[1] = cmds
+        self.i2c.writevto(self.addr, self.cmd_list)
+        self.transactions += 1
+        self.bytes += 1 + len(cmds)
 
     def write_data(self, buf):
         self.write_list[1] = buf
         self.i2c.writevto(self.addr, self.write_list)
+        self.transactions += 1
+        self.bytes += 1 + len(buf)
+
+    def write_views(self, k0, k1, page0, page1, per_page):
+        views = self.view_list
+        n = 1
+        for page in range(page0, page1 + 1):
+            for k in range(page * per_page + k0, page * per_page + k1):
+                views[n] = self.chunks[k]
+                self.bytes += len(views[n])
+                n += 1
+        self.i2c.writevto(self.addr, views)
+        for i in range(1, n):
+            views[i] = b""
+        self.transactions += 1
+        self.bytes += 1
+
+
+class SSD1306_SPI(SSD1306):
+    # 4-wire SPI: dc selects commands (0) or data (1), res is pulsed once to
+    # reset the controller and cs frames each transfer. SPI is fast enough
+    # that show() sends all changed pages in one burst.
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False, double_buffer=False, baudrate=10000000):
+        self.rate = baudrate
+        dc.init(dc.OUT, value=0)
+        res.init(res.OUT, value=0)
+        cs.init(cs.OUT, value=1)
+        self.spi = spi
+        self.dc = dc
+        self.res = res
+        self.cs = cs
+        self.temp = bytearray(1)
+        res(1)
+        sleep_ms(1)
+        res(0)
+        sleep_ms(10)
+        res(1)
+        super().__init__(width, height, external_vcc, double_buffer)
+        self.burst = True
 
+    def write_cmd(self, cmd):
+        self.temp[0] = cmd
+        self.write_cmds(self.temp)
+
+    def write_cmds(self, cmds):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(0)
+        self.cs(0)
+        self.spi.write(cmds)
+        self.cs(1)
+        self.transactions += 1
+        self.bytes += len(cmds)
+
+    def write_data(self, buf):
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(1)
+        self.cs(0)
+        self.spi.write(buf)
+        self.cs(1)
+        self.transactions += 1
+        self.bytes += len(buf)
+
+    def write_views(self, k0, k1, page0, page1, per_page):
+        # the views go out back to back within one cs frame
+        self.spi.init(baudrate=self.rate, polarity=0, phase=0)
+        self.cs(1)
+        self.dc(1)
+        self.cs(0)
+        for page in range(page0, page1 + 1):
+            for k in range(page * per_page + k0, page * per_page + k1):
+                self.spi.write(self.chunks[k])
+                self.bytes += len(self.chunks[k])
+        self.cs(1)
+        self.transactions += 1
+
+
+
+# time source for stats(); any ticks_* function works, e.g. time.ticks_cpu
+clock = ticks_us
 
 
 WIDTH = 128
 HEIGHT = 64
 
-i2c = machine.I2C(0)
-address = 60
-res_reg=8
-oled = SSD1306_I2C(WIDTH, HEIGHT, i2c)
-oled.fill(0)
+# Scales count halves of the stroke coordinates: NATIVE is the font as
+# drawn, 1 a compact half size font (8 rows on a 64 pixel panel), 3, 4, ...
+# larger ones for big readouts. Strokes get thicker from scale 4 on.
+NATIVE = 2
+
+# The display the text functions draw on. Nothing touches the bus when the
+# module is imported: the default display is set up on first use, or call
+# init() / use() to choose one.
+oled = None
+
+
+def init(i2c=None, width=WIDTH, height=HEIGHT, addr=0x3C, external_vcc=False, double_buffer=False, scale=NATIVE):
+    # create an SSD1306_I2C, by default on machine.I2C(0), and draw on it
+    # instead of the display in use, e.g. after a bus error
+    if i2c is None:
+        import machine
+        i2c = machine.I2C(0)
+    _release(oled)
+    return use(SSD1306_I2C(width, height, i2c, addr, external_vcc, double_buffer), scale)
+
+
+def init_spi(spi, dc, res, cs, width=WIDTH, height=HEIGHT, external_vcc=False, double_buffer=False, scale=NATIVE):
+    # create an SSD1306_SPI on spi with the given dc, res and cs Pins and draw
+    # on it instead of the display in use
+    _release(oled)
+    return use(SSD1306_SPI(width, height, spi, dc, res, cs, external_vcc, double_buffer), scale)
 
 
+def use(screen, scale=NATIVE):
+    # draw on an existing SSD1306 from now on, with the grid for glyphs at
+    # scale (see NATIVE); returns it. None goes back to setting up the
+    # default display on first use.
+    global oled
+    if screen is None:
+        _release(oled)
+    oled = screen
+    if screen is not None:
+        _use_grid(screen.width, screen.height, scale, screen)
+    return screen
+
+
+def _release(screen):
+    # hand the shared grids screen draws on back for the next display
+    if screen is None:
+        return
+    for key in list(_gridOwners):
+        if _gridOwners[key] == id(screen):
+            del _gridOwners[key]
+    screen.grids = {}
+
+
+def device():
+    if oled is None:
+        init()
+    return oled
+
+
+def stats():
+    # performance counters of the display in use, see SSD1306.stats()
+    return device().stats()
+
+
+def reset_stats():
+    device().reset_stats()
+
+
+
+# When typewriter is False (the default) glyphs are only drawn into the
+# framebuffer and the text functions send the finished frame with a single
+# show(). Set it to True to push every character to the panel as it is drawn.
+typewriter = False
+
 
 def clear():
-    oled.fill(0)
+    device().fill(0)
+    for p in displayArray:
+        p.ch = " "
+    _cleared()
+
+
+# The scoped clears below only erase, and so only mark for sending, part of
+# the frame. Like clear(), they don't send anything themselves.
+
+def clear_rect(x, y, w, h):
+    device().fill_rect(x, y, w, h, 0)
+    _covered(x, y, w, h, True)
+    _cleared()
+
+
+def _covered(x, y, w, h, blank=False, cells=None):
+    # Forget what the cells overlapping x, y, w, h show, as something else
+    # was drawn there; with blank, cells it wholly covers are known empty.
+    # cells defaults to those of the display in use.
+    if cells is None:
+        cells = displayArray
+    for p in cells:
+        pw, ph = glyph_size(p.scale)
+        if p.x < x + w and x < p.x + pw and p.y < y + h and y < p.y + ph:
+            if blank and x <= p.x and y <= p.y and p.x + pw <= x + w and p.y + ph <= y + h:
+                p.ch = " "
+            else:
+                p.ch = None
+
+
+def clear_cell(p):
+    w, h = glyph_size(p.scale)
+    device().fill_rect(p.x, p.y, w, h, 0)
+    p.ch = " "
+    _cleared()
+
+
+def clear_line(n):
+    # n counts rows from 1, as in line(); rows the panel hasn't got are left alone
+    if not 0 < n <= len(lineArrays):
+        return
+    p = lineArrays[n - 1][0]
+    clear_rect(0, p.y, device().width, glyph_size(p.scale)[1])
+
+
+def _cleared():
+    if scheduler is not None:
+        scheduler.request(oled)
+
+
+def _typed():
+    if typewriter:
+        device().show()
+
+
+# size of the box every glyph fits in
+GLYPH_WIDTH = 11
+GLYPH_HEIGHT = 18
+# distance between the cells of the position grid
+ADVANCE = 15
+LINE_PITCH = 22
+# rows every glyph but the tail of the comma fits in; a row of cells needs
+# this much height
+GLYPH_ROWS = 16
+
+
+_sizes = {}
+
+
+def glyph_size(scale=NATIVE):
+    # (width, height) of the box glyphs drawn at scale fit in; the same
+    # tuple every time, so the text functions don't allocate one per cell.
+    # Never taller than the row pitch, so cells of adjacent rows don't
+    # overlap: at scale 1 that clips the tail of the comma.
+    size = _sizes.get(scale)
+    if size is None:
+        weight = max(1, scale // NATIVE)
+        height = min((GLYPH_HEIGHT - 1) * scale // 2 + weight, pitch(scale)[1])
+        size = _sizes[scale] = ((GLYPH_WIDTH - 1) * scale // 2 + weight, height)
+    return size
+
+
+def pitch(scale=NATIVE):
+    # (horizontal, vertical) distance between the cells of a grid at scale
+    if scale < NATIVE:
+        return (ADVANCE * scale // 2, GLYPH_ROWS * scale // 2)
+    return (ADVANCE * scale // 2, LINE_PITCH * scale // 2)
+
+
+class Bitmap(framebuf.FrameBuffer):
+    # a small MONO_VLSB FrameBuffer that knows its own size, so blitting it
+    # onto the display only marks the area it covers
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.buffer = bytearray(((height + 7) // 8) * width)
+        super().__init__(self.buffer, width, height, framebuf.MONO_VLSB)
+
+
+# glyphs are rasterized once per scale, on first use, and blitted from then
+# on; keyed by the strokes, a font tuple or a built-in glyph number
+_glyphCache = {}
+_scaledCache = {}
+
+
+def raster(strokes, scale=NATIVE):
+    if scale == NATIVE:
+        cache = _glyphCache
+    else:
+        cache = _scaledCache.get(scale)
+        if cache is None:
+            cache = _scaledCache[scale] = {}
+    bitmap = cache.get(strokes)
+    if bitmap is None:
+        width, height = glyph_size(scale)
+        bitmap = Bitmap(width, height)
+        weight = max(1, scale // NATIVE)
+        for x1, y1, x2, y2 in _lines(strokes):
+            x1 = x1 * scale // 2
+            y1 = y1 * scale // 2
+            x2 = x2 * scale // 2
+            y2 = y2 * scale // 2
+            for dx in range(weight):
+                for dy in range(weight):
+                    bitmap.line(x1 + dx, y1 + dy, x2 + dx, y2 + dy, 1)
+        cache[strokes] = bitmap
+    return bitmap
+
+
+def glyph(strokes, p):
+    # strokes may also be a character, which is drawn from bitmap() like
+    # draw() does. Key 0 leaves the background alone, so glyphs are OR-ed in
+    # like lines are, and the cell no longer shows a known character.
+    if type(strokes) is str:
+        source = bitmap(strokes, p.scale)
+    elif strokes:
+        source = raster(strokes, p.scale)
+    else:
+        source = None
+    if source is not None:
+        device().blit(source, p.x, p.y, 0)
+    p.ch = None
+    _typed()
 
 
 #The Alphabet
-def A(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+5,(p.y)+1,1)
-    oled.line((p.x)+5,(p.y)+1,(p.x)+10,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+11,(p.x)+8,(p.y)+11,1)
+# Each glyph is drawn as strokes (x1, y1, x2, y2), relative to the top left
+# corner of the position it is drawn at. The built-in glyphs are kept as one
+# bytes blob of 4 bytes per stroke rather than ~300 tuples, which is what
+# raster() and _metrics() decode. Frozen with the module, the blob stays in
+# flash; with the frozen font it isn't even read at the native size.
+_strokeBlob = (
+    b"\x01\x0f\x05\x01\x05\x01\x0a\x0f\x03\x0b\x08\x0b"  # A
+    b"\x01\x0f\x01\x01\x01\x01\x06\x01\x06\x01\x08\x03\x08\x03\x08\x04"  # B
+    b"\x08\x04\x06\x07\x05\x07\x01\x07\x06\x07\x09\x0a\x09\x0a\x09\x0c"
+    b"\x09\x0c\x06\x0f\x06\x0f\x01\x0f"
+    b"\x0a\x02\x09\x01\x09\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # C
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x08\x0f\x08\x0f\x0a\x0d"
+    b"\x01\x0f\x01\x01\x01\x01\x06\x01\x06\x01\x09\x03\x09\x03\x09\x0c"  # D
+    b"\x09\x0c\x06\x0f\x06\x0f\x01\x0f"
+    b"\x01\x0f\x01\x01\x01\x01\x09\x01\x01\x07\x07\x07\x01\x0f\x09\x0f"  # E
+    b"\x01\x0f\x01\x01\x01\x01\x09\x01\x01\x07\x06\x07"  # F
+    b"\x09\x02\x08\x01\x08\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # G
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x08\x0f\x08\x0f\x0a\x0d"
+    b"\x0a\x0d\x0a\x09\x0a\x09\x06\x09"
+    b"\x01\x0f\x01\x01\x01\x07\x09\x07\x09\x0f\x09\x01"  # H
+    b"\x01\x01\x09\x01\x01\x0f\x09\x0f\x05\x0f\x05\x01"  # I
+    b"\x09\x01\x09\x0a\x09\x0a\x07\x0f\x07\x0f\x03\x0f\x03\x0f\x01\x0a"  # J
+    b"\x01\x0f\x01\x01\x01\x09\x08\x01\x04\x07\x09\x0f"  # K
+    b"\x01\x0f\x01\x01\x01\x0f\x09\x0f"  # L
+    b"\x01\x0f\x01\x01\x01\x01\x05\x07\x09\x01\x05\x07\x09\x0f\x09\x01"  # M
+    b"\x01\x0f\x01\x01\x01\x01\x09\x0f\x09\x0f\x09\x01"  # N
+    b"\x0a\x05\x08\x01\x08\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # O
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x07\x0f\x07\x0f\x0a\x0c"
+    b"\x0a\x0c\x0a\x05"
+    b"\x01\x0f\x01\x01\x01\x01\x07\x01\x07\x01\x09\x04\x09\x04\x09\x06"  # P
+    b"\x09\x06\x06\x09\x05\x09\x01\x09"
+    b"\x0a\x05\x08\x01\x08\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # Q
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x07\x0f\x07\x0f\x0a\x0c"
+    b"\x0a\x0c\x0a\x05\x06\x0a\x0a\x0f"
+    b"\x01\x0f\x01\x01\x01\x01\x07\x01\x07\x01\x09\x04\x09\x04\x09\x06"  # R
+    b"\x09\x06\x06\x09\x05\x09\x01\x09\x05\x09\x09\x0f"
+    b"\x09\x02\x07\x01\x07\x01\x03\x01\x03\x01\x02\x02\x03\x01\x02\x02"  # S
+    b"\x02\x02\x01\x05\x01\x05\x05\x07\x05\x07\x09\x08\x09\x08\x0a\x0b"
+    b"\x0a\x0b\x0a\x0d\x0a\x0d\x07\x0f\x07\x0f\x04\x0f\x04\x0f\x01\x0d"
+    b"\x05\x0f\x05\x01\x01\x01\x09\x01"  # T
+    b"\x01\x01\x01\x0d\x01\x0d\x03\x0f\x03\x0f\x07\x0f\x07\x0f\x09\x0d"  # U
+    b"\x09\x0d\x09\x01"
+    b"\x01\x01\x05\x0f\x05\x0f\x09\x01"  # V
+    b"\x01\x01\x03\x0f\x03\x0f\x05\x08\x05\x08\x08\x0f\x08\x0f\x0a\x01"  # W
+    b"\x01\x01\x09\x0f\x09\x01\x01\x0f"  # X
+    b"\x05\x0f\x05\x07\x05\x07\x01\x01\x05\x07\x0a\x01"  # Y
+    b"\x01\x01\x09\x01\x01\x0f\x09\x01\x01\x0f\x09\x0f"  # Z
+    b"\x0a\x05\x08\x01\x08\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # 0
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x07\x0f\x07\x0f\x0a\x0c"
+    b"\x0a\x0c\x0a\x05\x09\x04\x02\x0c"
+    b"\x05\x0f\x05\x01\x05\x01\x02\x03"  # 1
+    b"\x01\x03\x02\x01\x02\x01\x07\x01\x07\x01\x09\x03\x09\x03\x09\x06"  # 2
+    b"\x09\x06\x02\x0d\x02\x0d\x01\x0f\x01\x0f\x0a\x0f"
+    b"\x01\x03\x02\x01\x02\x01\x07\x01\x07\x01\x09\x03\x09\x03\x09\x05"  # 3
+    b"\x09\x05\x07\x07\x07\x07\x04\x07\x07\x08\x09\x09\x09\x09\x09\x0c"
+    b"\x09\x0c\x07\x0f\x07\x0f\x03\x0f\x03\x0f\x01\x0d"
+    b"\x08\x01\x08\x0f\x01\x01\x01\x07\x01\x07\x09\x07"  # 4
+    b"\x09\x01\x01\x01\x01\x01\x01\x07\x07\x07\x01\x07\x07\x08\x09\x09"  # 5
+    b"\x09\x09\x09\x0c\x09\x0c\x07\x0f\x07\x0f\x03\x0f\x03\x0f\x01\x0d"
+    b"\x0a\x03\x08\x01\x08\x01\x04\x01\x04\x01\x02\x03\x02\x03\x01\x07"  # 6
+    b"\x01\x07\x01\x0c\x01\x0c\x04\x0f\x04\x0f\x07\x0f\x07\x0f\x0a\x0d"
+    b"\x0a\x0d\x0a\x09\x0a\x09\x08\x07\x08\x07\x04\x07\x04\x07\x02\x09"
+    b"\x01\x01\x0a\x01\x0a\x01\x03\x0f"  # 7
+    b"\x04\x07\x02\x05\x02\x05\x02\x03\x02\x03\x03\x02\x03\x02\x04\x01"  # 8
+    b"\x04\x01\x06\x01\x06\x01\x07\x02\x07\x02\x08\x03\x08\x03\x08\x05"
+    b"\x08\x05\x06\x07\x01\x0a\x01\x0d\x01\x0d\x03\x0f\x03\x0f\x07\x0f"
+    b"\x07\x0f\x09\x0d\x09\x0d\x09\x0a\x09\x0a\x06\x07\x06\x07\x04\x07"
+    b"\x04\x07\x02\x09"
+    b"\x0a\x06\x08\x08\x08\x08\x03\x08\x03\x08\x01\x05\x01\x05\x01\x03"  # 9
+    b"\x01\x03\x03\x01\x03\x01\x08\x01\x08\x01\x0a\x03\x0a\x03\x0a\x0a"
+    b"\x0a\x0a\x09\x0d\x09\x0d\x07\x0f\x07\x0f\x03\x0f\x03\x0f\x01\x0d"
+    b"\x01\x0e\x02\x0e\x01\x0f\x02\x0f"  # .
+    b"\x01\x0e\x01\x0f\x01\x01\x01\x0a"  # !
+    b"\x05\x0e\x06\x0e\x05\x0f\x06\x0f\x05\x0a\x05\x08\x05\x08\x08\x06"  # ?
+    b"\x08\x06\x09\x02\x08\x01\x04\x01"
+    b"\x09\x01\x01\x0f"  # /
+    b"\x01\x0e\x02\x0e\x01\x0f\x02\x0f\x01\x06\x02\x06\x01\x05\x02\x05"  # :
+    b"\x01\x0d\x01\x0e\x02\x0d\x02\x11\x01\x11\x02\x11"  # ,
+    b"\x04\x07\x02\x05\x02\x05\x02\x03\x02\x03\x03\x02\x03\x02\x04\x01"  # &
+    b"\x04\x01\x06\x01\x06\x01\x07\x02\x07\x02\x08\x03\x08\x03\x08\x04"
+    b"\x08\x04\x06\x06\x06\x06\x01\x0a\x01\x0a\x01\x0d\x01\x0d\x03\x0f"
+    b"\x03\x0f\x06\x0f\x06\x0f\x09\x09\x04\x08\x0a\x0f"
+    b"\x05\x05\x05\x0b\x02\x08\x08\x08"  # +
+    b"\x02\x08\x08\x08"  # -
+    b"\x02\x06\x08\x06\x02\x09\x08\x09"  # =
+)
+# glyph n has strokes _strokeStarts[n] to _strokeStarts[n + 1] - 1
+_strokeStarts = (
+    b"\x00\x03\x0d\x15\x1b\x1f\x22\x2c\x2f\x32\x36\x39\x3b\x3f\x42\x4b"
+    b"\x51\x5b\x62\x6e\x70\x75\x77\x7b\x7d\x80\x83\x8d\x8f\x96\xa1\xa4"
+    b"\xac\xb8\xba\xcb\xd7\xd9\xdb\xe1\xe2\xe6\xe9\xf8\xfa\xfb\xfd"
+)
+# glyph number + 1 for each character code from 32, 0 if none; lower case
+# letters are drawn with the upper case glyphs
+_glyphIndex = (
+    b"\x00\x26\x00\x00\x00\x00\x2b\x00\x00\x00\x00\x2c\x2a\x2d\x25\x28"
+    b"\x1b\x1c\x1d\x1e\x1f\x20\x21\x22\x23\x24\x29\x00\x00\x2e\x00\x27"
+    b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x00\x00\x00\x00\x00"
+    b"\x00\x01\x02\x03\x04\x05\x06\x07\x08\x09\x0a\x0b\x0c\x0d\x0e\x0f"
+    b"\x10\x11\x12\x13\x14\x15\x16\x17\x18\x19\x1a\x00\x00\x00\x00"
+)
+
+
+# character -> strokes, for characters added or replaced at run time; they
+# take precedence over the built-in glyphs. E.g.
+# font["#"] = ((3,1,2,15), (8,1,7,15), (1,5,10,5), (1,11,10,11))
+font = {}
+
+
+def _lookup(ch):
+    # strokes for ch: a tuple from font, the number of a built-in glyph, or
+    # None if ch has nothing to draw
+    strokes = font.get(ch)
+    if strokes is not None:
+        return strokes or None
+    code = ord(ch) - 32
+    if 0 <= code < 95 and _glyphIndex[code]:
+        return _glyphIndex[code] - 1
+    return None
+
+
+def _lines(strokes):
+    # the (x1, y1, x2, y2) strokes of a tuple or built-in glyph number
+    if type(strokes) is not int:
+        for stroke in strokes:
+            yield stroke
+        return
+    blob = _strokeBlob
+    for i in range(_strokeStarts[strokes] * 4, _strokeStarts[strokes + 1] * 4, 4):
+        yield blob[i], blob[i + 1], blob[i + 2], blob[i + 3]
+
+
+# The glyph functions A(p), ..., nine(p), space(p) are made on demand by
+# __getattr__ below rather than kept around as ~50 function objects. The
+# letters are named after themselves, the rest as below.
+_glyphNames = ("zero", "one", "two", "three", "four", "five", "six", "seven", "eight", "nine",
+               "period", "exclam", "question", "slash", "colon", "comma", "amp", "plus", "minus", "equal", "space")
+_glyphChars = "0123456789.!?/:,&+-= "
+
+
+def __getattr__(name):
+    # glyph functions: ssd1306big.A(p) draws "A" at p. Each one is made on
+    # first use and kept in the module, so later lookups find it directly.
+    if len(name) == 1 and "A" <= name <= "Z":
+        ch = name
+    elif name in _glyphNames:
+        ch = _glyphChars[_glyphNames.index(name)]
+    else:
+        raise AttributeError(name)
 
-    oled.show()
-    
-def B(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+6,(p.y)+1,1)
-    oled.line((p.x)+6,(p.y)+1,(p.x)+8,(p.y)+3,1)
-    oled.line((p.x)+8,(p.y)+3,(p.x)+8,(p.y)+4,1)
-    oled.line((p.x)+8,(p.y)+4,(p.x)+6,(p.y)+7,1)
-    oled.line((p.x)+5,(p.y)+7,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+6,(p.y)+7,(p.x)+9,(p.y)+10,1)
-    oled.line((p.x)+9,(p.y)+10,(p.x)+9,(p.y)+12,1)
-    oled.line((p.x)+9,(p.y)+12,(p.x)+6,(p.y)+15,1)
-    oled.line((p.x)+6,(p.y)+15,(p.x)+1,(p.y)+15,1)
-    oled.show()    
-    
-def C(p):
-    oled.line((p.x)+10,(p.y)+2,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+9,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+8,(p.y)+15,1)
-    oled.line((p.x)+8,(p.y)+15,(p.x)+10,(p.y)+13,1)
-    oled.show()
-    
-def D(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+6,(p.y)+1,1)
-    oled.line((p.x)+6,(p.y)+1,(p.x)+9,(p.y)+3,1)
-    oled.line((p.x)+9,(p.y)+3,(p.x)+9,(p.y)+12,1)
-    oled.line((p.x)+9,(p.y)+12,(p.x)+6,(p.y)+15,1)
-    oled.line((p.x)+6,(p.y)+15,(p.x)+1,(p.y)+15,1)
-    oled.show()
-    
-def E(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+7,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+9,(p.y)+15,1)
-    oled.show()
-    
-def F(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+6,(p.y)+7,1)
-    oled.show()
-    
-def G(p):
-    oled.line((p.x)+9,(p.y)+2,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+8,(p.y)+15,1)
-    oled.line((p.x)+8,(p.y)+15,(p.x)+10,(p.y)+13,1)
-    oled.line((p.x)+10,(p.y)+13,(p.x)+10,(p.y)+9,1)
-    oled.line((p.x)+10,(p.y)+9,(p.x)+6,(p.y)+9,1)    
-    oled.show()
-
-def H(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+9,(p.y)+7,1)
-    oled.line((p.x)+9,(p.y)+15,(p.x)+9,(p.y)+1,1)
-    oled.show()
-
-def I(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+9,(p.y)+15,1)
-    oled.line((p.x)+5,(p.y)+15,(p.x)+5,(p.y)+1,1)
-    oled.show()
-
-def J(p):
-    oled.line((p.x)+9,(p.y)+1,(p.x)+9,(p.y)+10,1)
-    oled.line((p.x)+9,(p.y)+10,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+1,(p.y)+10,1)
-    oled.show()
-    
-def K(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+9,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+7,(p.x)+9,(p.y)+15,1)
-    oled.show()
-
-def L(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+9,(p.y)+15,1)
-    oled.show()
-    
-def M(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+5,(p.y)+7,1)
-    oled.line((p.x)+9,(p.y)+1,(p.x)+5,(p.y)+7,1)
-    oled.line((p.x)+9,(p.y)+15,(p.x)+9,(p.y)+1,1)
-    oled.show()
-
-def N(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+15,1)
-    oled.line((p.x)+9,(p.y)+15,(p.x)+9,(p.y)+1,1)
-    oled.show()
-
-def O(p):
-    oled.line((p.x)+10,(p.y)+5,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+10,(p.y)+12,1)
-    oled.line((p.x)+10,(p.y)+12,(p.x)+10,(p.y)+5,1)
-    oled.show()
-
-
-def P(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+7,(p.y)+1,1)
-    oled.line((p.x)+7,(p.y)+1,(p.x)+9,(p.y)+4,1)
-    oled.line((p.x)+9,(p.y)+4,(p.x)+9,(p.y)+6,1)
-    oled.line((p.x)+9,(p.y)+6, (p.x)+6,(p.y)+9,1)
-    oled.line((p.x)+5,(p.y)+9,(p.x)+1,(p.y)+9,1)
-    oled.show() 
-
-def Q(p):
-    oled.line((p.x)+10,(p.y)+5,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+10,(p.y)+12,1)
-    oled.line((p.x)+10,(p.y)+12,(p.x)+10,(p.y)+5,1)
-    oled.line((p.x)+6,(p.y)+10,(p.x)+10,(p.y)+15,1)
-    oled.show()
-
-def R(p):
-    oled.line((p.x)+1,(p.y)+15,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+7,(p.y)+1,1)
-    oled.line((p.x)+7,(p.y)+1,(p.x)+9,(p.y)+4,1)
-    oled.line((p.x)+9,(p.y)+4,(p.x)+9,(p.y)+6,1)
-    oled.line((p.x)+9,(p.y)+6, (p.x)+6,(p.y)+9,1)
-    oled.line((p.x)+5,(p.y)+9,(p.x)+1,(p.y)+9,1)
-    oled.line((p.x)+5,(p.y)+9,(p.x)+9,(p.y)+15,1)
-    oled.show()
-    
-def S(p):
-    oled.line((p.x)+9,(p.y)+2,(p.x)+7,(p.y)+1,1)
-    oled.line((p.x)+7,(p.y)+1,(p.x)+3,(p.y)+1,1)
-    oled.line((p.x)+3,(p.y)+1,(p.x)+2,(p.y)+2,1)
-    oled.line((p.x)+3,(p.y)+1,(p.x)+2,(p.y)+2,1)    
-    oled.line((p.x)+2,(p.y)+2,(p.x)+1,(p.y)+5,1)
-    oled.line((p.x)+1,(p.y)+5,(p.x)+5,(p.y)+7,1)
-    oled.line((p.x)+5,(p.y)+7,(p.x)+9,(p.y)+8,1)
-    oled.line((p.x)+9,(p.y)+8,(p.x)+10,(p.y)+11,1)
-    oled.line((p.x)+10,(p.y)+11,(p.x)+10,(p.y)+13,1)
-    oled.line((p.x)+10,(p.y)+13,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+1,(p.y)+13,1)
-    #oled.line((p.x)+10,(p.y)+13,(p.x)+7,(p.y)+15,1)
-    oled.show()
-
-def T(p):
-    oled.line((p.x)+5,(p.y)+15,(p.x)+5,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+1,1)
-    oled.show()
-    
-def U(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+1,(p.y)+13,1)
-    oled.line((p.x)+1,(p.y)+13,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+9,(p.y)+13,1)
-    oled.line((p.x)+9,(p.y)+13,(p.x)+9,(p.y)+1,1)
-    oled.show()
-
-def V(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+5,(p.y)+15,1)
-    oled.line((p.x)+5,(p.y)+15,(p.x)+9,(p.y)+1,1)
-    oled.show()
-
-def W(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+5,(p.y)+8,1)
-    oled.line((p.x)+5,(p.y)+8,(p.x)+8,(p.y)+15,1)
-    oled.line((p.x)+8,(p.y)+15,(p.x)+10,(p.y)+1,1)
-    oled.show()
-
-def X(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+15,1)
-    oled.line((p.x)+9,(p.y)+1,(p.x)+1,(p.y)+15,1)
-    oled.show()
-
-def Y(p):
-    oled.line((p.x)+5,(p.y)+15,(p.x)+5,(p.y)+7,1)
-    oled.line((p.x)+5,(p.y)+7,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+5,(p.y)+7,(p.x)+10,(p.y)+1,1)
-    oled.show()
-
-def Z(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+9,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+9,(p.y)+15,1)
-    oled.show()
-
-def period(p):
-    oled.line((p.x)+1,(p.y)+14,(p.x)+2,(p.y)+14,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+2,(p.y)+15,1)
-    oled.show()
-
-def exclam(p):
-    oled.line((p.x)+1,(p.y)+14,(p.x)+1,(p.y)+15,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+1,(p.y)+10,1)
-    oled.show()
-
-def plus(p):
-    oled.line((p.x)+5,(p.y)+5,(p.x)+5,(p.y)+11,1)
-    oled.line((p.x)+2,(p.y)+8,(p.x)+8,(p.y)+8,1)
-    oled.show()
-    
-def minus(p):
-    oled.line((p.x)+2,(p.y)+8,(p.x)+8,(p.y)+8,1)
-    oled.show()
-    
-def equal(p):
-    oled.line((p.x)+2,(p.y)+6,(p.x)+8,(p.y)+6,1)
-    oled.line((p.x)+2,(p.y)+9,(p.x)+8,(p.y)+9,1)
-    oled.show()
-
-def comma(p):
-    oled.line((p.x)+1,(p.y)+13,(p.x)+1,(p.y)+14,1)
-    oled.line((p.x)+2,(p.y)+13,(p.x)+2,(p.y)+17,1)
-    oled.line((p.x)+1,(p.y)+17,(p.x)+2,(p.y)+17,1)
-    oled.show()
-
-def colon(p):
-    oled.line((p.x)+1,(p.y)+14,(p.x)+2,(p.y)+14,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+2,(p.y)+15,1)
-    oled.line((p.x)+1,(p.y)+6,(p.x)+2,(p.y)+6,1)
-    oled.line((p.x)+1,(p.y)+5,(p.x)+2,(p.y)+5,1)
-    oled.show()
-
-
-def slash(p):
-    oled.line((p.x)+9,(p.y)+1,(p.x)+1,(p.y)+15,1)
-    oled.show()
-    
-def question(p):
-    oled.line((p.x)+5,(p.y)+14,(p.x)+6,(p.y)+14,1)
-    oled.line((p.x)+5,(p.y)+15,(p.x)+6,(p.y)+15,1)
-    oled.line((p.x)+5,(p.y)+10,(p.x)+5,(p.y)+8,1)
-    oled.line((p.x)+5,(p.y)+8,(p.x)+8,(p.y)+6,1)
-    oled.line((p.x)+8,(p.y)+6,(p.x)+9,(p.y)+2,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-
-    oled.show()
-
-
-def amp(p):
-    #&
-    oled.line((p.x)+4,(p.y)+7,(p.x)+2,(p.y)+5,1)
-    oled.line((p.x)+2,(p.y)+5,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+3,(p.y)+2,1)
-    oled.line((p.x)+3,(p.y)+2,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+6,(p.y)+1,1)
-    oled.line((p.x)+6,(p.y)+1,(p.x)+7,(p.y)+2,1)
-    oled.line((p.x)+7,(p.y)+2,(p.x)+8,(p.y)+3,1)
-    oled.line((p.x)+8,(p.y)+3,(p.x)+8,(p.y)+4,1)
-    oled.line((p.x)+8,(p.y)+4,(p.x)+6,(p.y)+6,1)
-    oled.line((p.x)+6,(p.y)+6,(p.x)+1,(p.y)+10,1)
-    oled.line((p.x)+1,(p.y)+10,(p.x)+1,(p.y)+13,1)
-    oled.line((p.x)+1,(p.y)+13,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+6,(p.y)+15,1)
-    oled.line((p.x)+6,(p.y)+15,(p.x)+9,(p.y)+9,1)
-    oled.line((p.x)+4,(p.y)+8,(p.x)+10,(p.y)+15,1)
-    
-    oled.show()
-
-
-def zero(p):
-    oled.line((p.x)+10,(p.y)+5,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+10,(p.y)+12,1)
-    oled.line((p.x)+10,(p.y)+12,(p.x)+10,(p.y)+5,1)
-    oled.line((p.x)+9,(p.y)+4,(p.x)+2,(p.y)+12,1)
-    oled.show()
-
-def one(p):
-    oled.line((p.x)+5,(p.y)+15,(p.x)+5,(p.y)+1,1)
-    oled.line((p.x)+5,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.show()
-
-def two(p):
-    oled.line((p.x)+1,(p.y)+3,(p.x)+2,(p.y)+1,1)
-    oled.line((p.x)+2,(p.y)+1,(p.x)+7,(p.y)+1,1)    
-    oled.line((p.x)+7,(p.y)+1,(p.x)+9,(p.y)+3,1)
-    oled.line((p.x)+9,(p.y)+3,(p.x)+9,(p.y)+6,1)
-    oled.line((p.x)+9,(p.y)+6,(p.x)+2,(p.y)+13,1)
-    oled.line((p.x)+2,(p.y)+13,(p.x)+1,(p.y)+15,1)
-    oled.line((p.x)+1,(p.y)+15,(p.x)+10,(p.y)+15,1)
-    oled.show()
-    
+    def draw_glyph(p):
+        glyph(ch, p)
+    globals()[name] = draw_glyph
+    return draw_glyph
 
-def three(p):
-    oled.line((p.x)+1,(p.y)+3,(p.x)+2,(p.y)+1,1)
-    oled.line((p.x)+2,(p.y)+1,(p.x)+7,(p.y)+1,1)    
-    oled.line((p.x)+7,(p.y)+1,(p.x)+9,(p.y)+3,1)
-    oled.line((p.x)+9,(p.y)+3,(p.x)+9,(p.y)+5,1)
-    oled.line((p.x)+9,(p.y)+5,(p.x)+7,(p.y)+7,1)
-    oled.line((p.x)+7,(p.y)+7,(p.x)+4,(p.y)+7,1)    
-    oled.line((p.x)+7,(p.y)+8,(p.x)+9,(p.y)+9,1)
-    oled.line((p.x)+9,(p.y)+9,(p.x)+9,(p.y)+12,1)
-    oled.line((p.x)+9,(p.y)+12,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+1,(p.y)+13,1)    
-
-    oled.show()
-
-def four(p):
-    oled.line((p.x)+8,(p.y)+1,(p.x)+8,(p.y)+15,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+9,(p.y)+7,1)
-    oled.show()
-
-def five(p):
-    oled.line((p.x)+9,(p.y)+1,(p.x)+1,(p.y)+1,1)
-    oled.line((p.x)+1,(p.y)+1,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+7,(p.y)+7,(p.x)+1,(p.y)+7,1)    
-    oled.line((p.x)+7,(p.y)+8,(p.x)+9,(p.y)+9,1)
-    oled.line((p.x)+9,(p.y)+9,(p.x)+9,(p.y)+12,1)
-    oled.line((p.x)+9,(p.y)+12,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+1,(p.y)+13,1)
-    oled.show()
-
-def six(p):
-    oled.line((p.x)+10,(p.y)+3,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+1,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+7,(p.x)+1,(p.y)+12,1)
-    oled.line((p.x)+1,(p.y)+12,(p.x)+4,(p.y)+15,1)
-    oled.line((p.x)+4,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+10,(p.y)+13,1)
-    oled.line((p.x)+10,(p.y)+13,(p.x)+10,(p.y)+9,1)
-    oled.line((p.x)+10,(p.y)+9,(p.x)+8,(p.y)+7,1)
-    oled.line((p.x)+8,(p.y)+7,(p.x)+4,(p.y)+7,1)
-    oled.line((p.x)+4,(p.y)+7,(p.x)+2,(p.y)+9,1)
-    oled.show()
-    
 
-def seven(p):
-    oled.line((p.x)+1,(p.y)+1,(p.x)+10,(p.y)+1,1)
-    oled.line((p.x)+10,(p.y)+1,(p.x)+3,(p.y)+15,1)
-    oled.show()
-    
-def eight(p):
-    oled.line((p.x)+4,(p.y)+7,(p.x)+2,(p.y)+5,1)
-    oled.line((p.x)+2,(p.y)+5,(p.x)+2,(p.y)+3,1)
-    oled.line((p.x)+2,(p.y)+3,(p.x)+3,(p.y)+2,1)
-    oled.line((p.x)+3,(p.y)+2,(p.x)+4,(p.y)+1,1)
-    oled.line((p.x)+4,(p.y)+1,(p.x)+6,(p.y)+1,1)
-    oled.line((p.x)+6,(p.y)+1,(p.x)+7,(p.y)+2,1)
-    oled.line((p.x)+7,(p.y)+2,(p.x)+8,(p.y)+3,1)
-    oled.line((p.x)+8,(p.y)+3,(p.x)+8,(p.y)+5,1)
-    oled.line((p.x)+8,(p.y)+5,(p.x)+6,(p.y)+7,1)
-    oled.line((p.x)+1,(p.y)+10,(p.x)+1,(p.y)+13,1)
-    oled.line((p.x)+1,(p.y)+13,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+9,(p.y)+13,1)
-    oled.line((p.x)+9,(p.y)+13,(p.x)+9,(p.y)+10,1)
-    oled.line((p.x)+9,(p.y)+10,(p.x)+6,(p.y)+7,1)
-    oled.line((p.x)+6,(p.y)+7,(p.x)+4,(p.y)+7,1)
-    oled.line((p.x)+4,(p.y)+7,(p.x)+2,(p.y)+9,1)
-    oled.show()
-
-def nine(p):
-    oled.line((p.x)+10,(p.y)+6,(p.x)+8,(p.y)+8,1)
-    oled.line((p.x)+8,(p.y)+8,(p.x)+3,(p.y)+8,1)
-    oled.line((p.x)+3,(p.y)+8,(p.x)+1,(p.y)+5,1)
-    oled.line((p.x)+1,(p.y)+5,(p.x)+1,(p.y)+3,1)
-    oled.line((p.x)+1,(p.y)+3,(p.x)+3,(p.y)+1,1)
-    oled.line((p.x)+3,(p.y)+1,(p.x)+8,(p.y)+1,1)
-    oled.line((p.x)+8,(p.y)+1,(p.x)+10,(p.y)+3,1)
-    oled.line((p.x)+10,(p.y)+3,(p.x)+10,(p.y)+10,1)
-    oled.line((p.x)+10,(p.y)+10,(p.x)+9,(p.y)+13,1)
-    oled.line((p.x)+9,(p.y)+13,(p.x)+7,(p.y)+15,1)
-    oled.line((p.x)+7,(p.y)+15,(p.x)+3,(p.y)+15,1)
-    oled.line((p.x)+3,(p.y)+15,(p.x)+1,(p.y)+13,1)
-    oled.show()
-
-def space(p):
-    oled.show()
-    
+def __dir__():
+    # list the glyph functions too, made or not
+    names = set(globals())
+    names.update("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    names.update(_glyphNames)
+    return sorted(names)
+
     
 #positon object 
 
 class Pos:
-    def __init__(self, x, y):
+    def __init__(self, x, y, scale=NATIVE):
         self.x=x
         self.y=y
+        self.scale=scale
+        # character shown in this cell, None if unknown
+        self.ch=None
        
-#define position x and y   
-p0=Pos(0,0)
-p1=Pos(15,0)
-p2=Pos(30,0)
-p3=Pos(45,0)
-p4=Pos(60,0)
-p5=Pos(75,0)
-p6=Pos(90,0)
-p7=Pos(105,0)
-p8=Pos(0,22)
-p9=Pos(15,22)
-p10=Pos(30,22)
-p11=Pos(45,22)
-p12=Pos(60,22)
-p13=Pos(75,22)
-p14=Pos(90,22)
-p15=Pos(105,22)
-p16=Pos(0,44)
-p17=Pos(15,44)
-p18=Pos(30,44)
-p19=Pos(45,44)
-p20=Pos(60,44)
-p21=Pos(75,44)
-p22=Pos(90,44)
-p23=Pos(105,44)
-
-line1Array=[p0,p1,p2,p3,p4,p5,p6,p7]
-line2Array=[p8,p9,p10,p11,p12,p13,p14,p15]
-line3Array=[p16,p17,p18,p19,p20,p21,p22,p23]
-displayArray=[p0,p1,p2,p3,p4,p5,p6,p7,p8,p9,p10,p11,p12,p13,p14,p15,p16,p17,p18,p19,p20,p21,p22,p23]
-
+# Position grids are worked out from the panel size and the font metrics,
+# once per panel size
+_grids = {}
+# id() of the display drawing on the shared grid of each (width, height,
+# scale); the id rather than the display, so a dropped display is freed
+_gridOwners = {}
+
+
+def _make_grid(width, height, scale):
+    glyph_width = glyph_size(scale)[0]
+    rows = GLYPH_ROWS * scale // 2 + max(1, scale // NATIVE) - 1
+    dx, dy = pitch(scale)
+    cells = []
+    lines = []
+    for row in range(max(1, (height - rows) // dy + 1)):
+        line = [Pos(col * dx, row * dy, scale) for col in range((width - glyph_width) // dx + 1)]
+        cells.extend(line)
+        lines.append(line)
+    return (cells, lines)
+
+
+def grid(width, height, scale=NATIVE):
+    # the cells of glyphs at scale that fit on a width x height panel, row
+    # by row: returns (displayArray, lineArrays)
+    key = (width, height, scale)
+    cached = _grids.get(key)
+    if cached is None:
+        cached = _grids[key] = _make_grid(width, height, scale)
+    return cached
+
+
+# scale of the grid the text functions use, see use()
+gridScale = NATIVE
+
+
+def _use_grid(width, height, scale=NATIVE, screen=None):
+    # Every display keeps its own cells, in screen.grids, so the retained
+    # text of one panel is never taken for that of another. The first
+    # display of a size draws on the shared grid, which p0-p23 belong to.
+    global displayArray, lineArrays, line1Array, line2Array, line3Array, gridScale
+    gridScale = scale
+    if screen is None:
+        cells = grid(width, height, scale)
+    else:
+        cells = screen.grids.get(scale)
+        if cells is None:
+            key = (width, height, scale)
+            if _gridOwners.get(key, id(screen)) == id(screen):
+                _gridOwners[key] = id(screen)
+                cells = grid(width, height, scale)
+            else:
+                cells = _make_grid(width, height, scale)
+            screen.grids[scale] = cells
+    displayArray, lineArrays = cells
+    # panels with fewer than three rows get empty arrays for the others
+    line1Array, line2Array, line3Array = (lineArrays + [[], [], []])[:3]
+
+
+_use_grid(WIDTH, HEIGHT)
+# the cells of the default 128x64 grid, by their original names
+p0, p1, p2, p3, p4, p5, p6, p7, p8, p9, p10, p11, p12, p13, p14, p15, p16, p17, p18, p19, p20, p21, p22, p23 = displayArray
+
+
+
+# blit sources made by _frozen(), per glyph number, so drawing a character
+# allocates nothing after its first use
+_frozenSources = {}
+
+
+def _frozen(ch):
+    # blit source for ch from the frozen font, or None if it has no glyph
+    code = ord(ch) - frozenFont.FIRST
+    if code < 0 or code >= len(frozenFont.INDEX) or not frozenFont.INDEX[code]:
+        return None
+    n = frozenFont.INDEX[code] - 1
+    source = _frozenSources.get(n)
+    if source is None:
+        offset = frozenFont.OFFSETS[2 * n] | frozenFont.OFFSETS[2 * n + 1] << 8
+        width = frozenFont.WIDTHS[n]
+        data = memoryview(frozenFont.BITMAPS)[offset:offset + frozenFont.PAGES * width]
+        source = _frozenSources[n] = (data, width, frozenFont.HEIGHT, framebuf.MONO_VLSB)
+    return source
+
+
+# (strokes, Bitmap) per character, one dict per scale. Looking a glyph up by
+# its character hashes a short string rather than the whole stroke tuple;
+# the strokes are kept to notice when a font entry is replaced.
+_charBitmaps = {}
+_scaledChars = {}
+
+
+def bitmap(ch, scale=NATIVE):
+    # something blit() can draw for ch, or None for blanks and unknown
+    # characters. Characters in font were added or replaced at run time, so
+    # the frozen font doesn't have them.
+    if frozenFont is not None and scale == NATIVE and ch not in font:
+        frozen = _frozen(ch)
+        if frozen is not None:
+            return frozen
+    strokes = _lookup(ch)
+    if strokes is None:
+        return None
+    if scale == NATIVE:
+        cache = _charBitmaps
+    else:
+        cache = _scaledChars.get(scale)
+        if cache is None:
+            cache = _scaledChars[scale] = {}
+    entry = cache.get(ch)
+    if entry is None or entry[0] is not strokes:
+        entry = cache[ch] = (strokes, raster(strokes, scale))
+    return entry[1]
+
+
+def draw(text, posArray):
+    # draw into the framebuffer only; characters without a glyph, and those
+    # beyond the last position, are skipped
+    screen = device()
+    for i in range(min(len(text), len(posArray))):
+        p = posArray[i]
+        source = bitmap(text[i], p.scale)
+        if source is not None:
+            screen.blit(source, p.x, p.y, 0)
+        # OR-ed over whatever was there
+        p.ch = None
+        _typed()
+
+
+# When retain is True, display(), line1()-line3(), flow() and wrap() remember
+# what each cell shows and only erase and redraw the cells whose character
+# changed, so there is no need to clear() between updates.
+retain = False
+
+
+def update(text, posArray):
+    # make the cells of posArray show text, padded with blanks
+    screen = device()
+    for i in range(len(posArray)):
+        ch = text[i] if i < len(text) else " "
+        p = posArray[i]
+        if p.ch == ch:
+            continue
+        if p.ch != " ":
+            w, h = glyph_size(p.scale)
+            screen.fill_rect(p.x, p.y, w, h, 0)
+        source = bitmap(ch, p.scale)
+        if source is not None:
+            screen.blit(source, p.x, p.y, 0)
+        p.ch = ch
+        _typed()
+
+
+# When set, by Scheduler.start() or Refresher.start(), flush() hands the
+# display to it with scheduler.request(display) instead of sending the frame
+# itself.
+scheduler = None
+
+
+def flush():
+    if typewriter:
+        return
+    if scheduler is not None:
+        scheduler.request(device())
+    else:
+        device().show()
 
 
 def display(text, posArray):
-    for i in range (len(text)):
-        if text[i]=="A" or text[i]=="a":
-            A(posArray[i])
-        if text[i]=="B" or text[i]=="b":
-            B(posArray[i])
-        if text[i]=="C" or text[i]=="c":
-            C(posArray[i])
-        if text[i]=="D" or text[i]=="d":
-            D(posArray[i])
-        if text[i]=="E" or text[i]=="e":
-            E(posArray[i])
-        if text[i]=="F" or text[i]=="f":
-            F(posArray[i])
-        if text[i]=="G" or text[i]=="g":
-            G(posArray[i])
-        if text[i]=="H" or text[i]=="h":
-            H(posArray[i])
-        if text[i]=="I" or text[i]=="i":
-            I(posArray[i])
-        if text[i]=="J" or text[i]=="j":
-            J(posArray[i])
-        if text[i]=="K" or text[i]=="k":
-            K(posArray[i])
-        if text[i]=="L" or text[i]=="l":
-            L(posArray[i])
-        if text[i]=="M" or text[i]=="m":
-            M(posArray[i])
-        if text[i]=="N" or text[i]=="n":
-            N(posArray[i])
-        if text[i]=="O" or text[i]=="o":
-            O(posArray[i])
-        if text[i]=="P" or text[i]=="p":
-            P(posArray[i])
-        if text[i]=="Q" or text[i]=="q":
-            Q(posArray[i])
-        if text[i]=="R" or text[i]=="r":
-            R(posArray[i])
-        if text[i]=="S" or text[i]=="s":
-            S(posArray[i])
-        if text[i]=="T" or text[i]=="t":
-            T(posArray[i])
-        if text[i]=="U" or text[i]=="u":
-            U(posArray[i])
-        if text[i]=="V" or text[i]=="v":
-            V(posArray[i])
-        if text[i]=="W" or text[i]=="w":
-            W(posArray[i])
-        if text[i]=="X" or text[i]=="x":
-            X(posArray[i])
-        if text[i]=="Y" or text[i]=="y":
-            Y(posArray[i])
-        if text[i]=="Z" or text[i]=="z":
-            Z(posArray[i])
-        if text[i]=="0":
-            zero(posArray[i])
-        if text[i]=="1":
-            one(posArray[i])
-        if text[i]=="2":
-            two(posArray[i])
-        if text[i]=="3":
-            three(posArray[i])
-        if text[i]=="4":
-            four(posArray[i])
-        if text[i]=="5":
-            five(posArray[i])
-        if text[i]=="6":
-            six(posArray[i])
-        if text[i]=="7":
-            seven(posArray[i])
-        if text[i]=="8":
-            eight(posArray[i])
-        if text[i]=="9":
-            nine(posArray[i])
-        if text[i]==".":
-            period(posArray[i])
-        if text[i]=="!":
-            exclam(posArray[i])
-        if text[i]=="?":
-            question(posArray[i])
-        if text[i]=="/":
-            slash(posArray[i])
-        if text[i]==":":
-            colon(posArray[i])
-        if text[i]==",":
-            comma(posArray[i])
-        if text[i]=="&":
-            amp(posArray[i])
-        if text[i]=="+":
-            plus(posArray[i])
-        if text[i]=="-":
-            minus(posArray[i])
-        if text[i]=="=":
-            equal(posArray[i])
-        if text[i]==" ":
-            space(posArray[i])
+    start = clock()
+    if retain:
+        update(text, posArray)
+    else:
+        draw(text, posArray)
+    flush()
+    _timed(start)
 
 
+def _timed(start):
+    # add a text function call that started at start to the display's stats()
+    screen = device()
+    screen.text_calls += 1
+    screen.text_us += ticks_diff(clock(), start)
+
+
+def line(n, text):
+    # show text on row n of the grid, counting from 1. Rows the panel hasn't
+    # got show nothing, so the same code runs on every panel size.
+    display(text, lineArrays[n - 1] if 0 < n <= len(lineArrays) else [])
 
 def line1(line1text):
-    display(line1text, line1Array)
+    line(1, line1text)
 
 def line2(line2text):
-    display(line2text, line2Array)
+    line(2, line2text)
 
 def line3(line3text):
-    display(line3text, line3Array)
+    line(3, line3text)
     
 def flow(string):
     display(string, displayArray)
     
-def wrap(string):
-    if len(string)> 8:
-        spaceArray = []
-        cut1 = 23
-        cut2 = 23
-        cut3 = 23
-        for character in range (len(string)):
-            if string[character] == " ":
-                spaceArray.append(character)
-        for i in range (len(spaceArray)):    
-            if spaceArray[i] < 8 :
-                cut1= spaceArray[i]
-                #cut[0]=space
-            
-            if 8 < spaceArray[i] < 16 :
-                cut2=spaceArray[i]
-               
-            if 16 < spaceArray[i] < 24 :
-                cut3=spaceArray[i]
-              
-        line1(string[0:(cut1)])
-        line2(string[(cut1+1):(cut2)])
-        line3(string[(cut2+1):(cut3)])
-        
+def wrap(string, overflow="clip", advance=None):
+    # word wrap string over the three lines; see layout() for overflow and
+    # pass advance=proportional to fit more characters on each line
+    start = clock()
+    show_layout(layout(string, overflow=overflow, advance=advance))
+    _timed(start)
+
+
+# An advance function gives the native (scale NATIVE) distance from one
+# character to the next; at other scales it is scaled per character, like
+# the cells of a grid.
+
+def _fixed(ch):
+    return ADVANCE
+
+
+# blank columns proportional() leaves between the ink of two characters,
+# on top of the empty first column every glyph has, and the advance of a space
+GAP = 2
+SPACE_ADVANCE = 6
+
+# proportional advances of the characters from 32 to 126, worked out from
+# the strokes on first use
+_advances = None
+
+
+def _metrics():
+    global _advances
+    _advances = bytearray(95)
+    for code in range(32, 127):
+        strokes = _lookup(chr(code))
+        if strokes is not None:
+            right = 0
+            for x1, y1, x2, y2 in _lines(strokes):
+                right = max(right, x1, x2)
+            _advances[code - 32] = min(right, GLYPH_WIDTH - 1) + 1 + GAP
+        else:
+            _advances[code - 32] = SPACE_ADVANCE
+    return _advances
+
+
+def proportional(ch):
+    # advance function giving each glyph only the width its strokes take
+    advances = _advances or _metrics()
+    code = ord(ch) - 32
+    if 0 <= code < 95:
+        return advances[code]
+    return SPACE_ADVANCE
+
+
+def _trailing(advance, scale):
+    # blank columns an advance function leaves after the last character
+    if advance is proportional:
+        # at scale 1 rounding can leave wide glyphs touching the next one
+        return GAP * scale // 2 if scale >= NATIVE else 0
+    return ADVANCE * scale // 2 - glyph_size(scale)[0]
+
+
+def draw_at(text, x, y, advance=None, scale=NATIVE):
+    # draw text with its first character at x, y; returns the x after it
+    if advance is None:
+        advance = _fixed
+    screen = device()
+    start = x
+    for i in range(len(text)):
+        ch = text[i]
+        source = bitmap(ch, scale)
+        if source is not None:
+            screen.blit(source, x, y, 0)
+        x += advance(ch) * scale // 2
+        _typed()
+    if text:
+        # OR-ed over any cells underneath, see draw()
+        width, height = glyph_size(scale)
+        _covered(start, y, x - start + width, height)
+    return x
+
+
+def measure(text, advance=None, scale=NATIVE):
+    # width in pixels of text, without the gap after the last character
+    if advance is None:
+        advance = _fixed
+    width = 0
+    for i in range(len(text)):
+        width += advance(text[i]) * scale // 2
+    return width - _trailing(advance, scale) if text else 0
+
+
+class Layout:
+    # text broken into pages of lines by layout(), drawn by show_layout()
+    def __init__(self, text, pages, advance, scale):
+        self.text = text
+        self.pages = pages
+        self.lines = pages[0]
+        self.advance = advance
+        self.scale = scale
+
+
+# recent layouts, so showing the same text again costs no line breaking
+LAYOUT_CACHE = 8
+_layouts = {}
+
+
+def layout(text, lines=None, width=None, overflow="clip", advance=None, scale=None):
+    # Break text into lines no wider than width pixels, at spaces where
+    # possible, in one pass. Newlines force a break. overflow decides what
+    # happens to text that doesn't fit in `lines` lines: "clip" drops it,
+    # "ellipsis" ends the last line with "...", "page" keeps it on further
+    # pages of the layout. lines and scale default to those of the grid.
+    if lines is None:
+        lines = len(lineArrays)
+    if scale is None:
+        scale = gridScale
+    if width is None:
+        width = oled.width if oled is not None else WIDTH
+    key = (text, lines, width, overflow, advance, scale)
+    cached = _layouts.get(key)
+    if cached is not None:
+        return cached
+    step = _fixed if advance is None else advance
+    # a line fits if it does, leaving out the gap after its last character
+    limit = width + _trailing(step, scale)
+    out = []
+    start = 0      # start of the current line
+    used = 0       # width of text[start:i]
+    brk = -1       # last space in the current line
+    after = 0      # width of text[start:brk + 1]
+    for i in range(len(text)):
+        ch = text[i]
+        if ch == "\n":
+            out.append(text[start:i].rstrip())
+            start = i + 1
+            used = 0
+            brk = -1
+            continue
+        if ch == " " and i == start:
+            # no blanks at the start of a line
+            start = i + 1
+            continue
+        w = step(ch) * scale // 2
+        while used + w > limit and i > start:
+            if ch == " ":
+                out.append(text[start:i].rstrip())
+                start = i + 1
+                used = 0
+                brk = -1
+                break
+            if brk >= start:
+                out.append(text[start:brk].rstrip())
+                start = brk + 1
+                used -= after
+            else:
+                # a word longer than the line
+                out.append(text[start:i])
+                start = i
+                used = 0
+            brk = -1
+        if start > i:
+            continue
+        if ch == " ":
+            brk = i
+            after = used + w
+        used += w
+    if start < len(text):
+        out.append(text[start:].rstrip())
+    if not out:
+        out.append("")
+    if len(out) > lines:
+        if overflow == "page":
+            pages = [out[i:i + lines] for i in range(0, len(out), lines)]
+        elif overflow == "ellipsis":
+            last = out[lines - 1]
+            while last and measure(last + "...", advance, scale) > width:
+                last = last[:-1]
+            out[lines - 1] = last.rstrip() + "..."
+            pages = [out[:lines]]
+        else:
+            pages = [out[:lines]]
     else:
-        line1(string)
-    #line2(line2text)
-    #line3(line3text)
-    
+        pages = [out]
+    result = Layout(text, pages, advance, scale)
+    if len(_layouts) >= LAYOUT_CACHE:
+        _layouts.pop(next(iter(_layouts)))
+    _layouts[key] = result
+    return result
+
+
+def show_layout(lay, page=0, x=0, y=0, spacing=None):
+    # draw one page of a layout and send it. At the default place and
+    # spacing with fixed advance at the grid's scale it goes through the
+    # line arrays, so retain applies; otherwise lines are drawn with
+    # draw_at(), spacing pixels apart.
+    lines = lay.pages[page]
+    if x == 0 and y == 0 and spacing is None and lay.advance is None and lay.scale == gridScale:
+        for n in range(len(lineArrays)):
+            text = lines[n] if n < len(lines) else ""
+            if retain:
+                update(text, lineArrays[n])
+            else:
+                draw(text, lineArrays[n])
+    else:
+        if spacing is None:
+            spacing = pitch(lay.scale)[1]
+        for n in range(len(lines)):
+            draw_at(lines[n], x, y + n * spacing, lay.advance, lay.scale)
+    flush()
+
+
+# Rendered labels: whole strings drawn once into a strip and blitted in one
+# go afterwards. The least recently shown strips are dropped once they take
+# more than STRIP_BUDGET bytes.
+STRIP_BUDGET = 2048
+_strips = OrderedDict()
+_stripBytes = 0
+
+
+def strip(text, advance=None, scale=NATIVE):
+    # text rendered into a Bitmap of its own, from the cache if it is there
+    global _stripBytes
+    key = (text, advance, scale)
+    cached = _strips.pop(key, None)
+    if cached is None:
+        cached = Bitmap(max(1, measure(text, advance, scale)), glyph_size(scale)[1])
+        if advance is None:
+            advance = _fixed
+        x = 0
+        for i in range(len(text)):
+            source = bitmap(text[i], scale)
+            if source is not None:
+                cached.blit(source, x, 0, 0)
+            x += advance(text[i]) * scale // 2
+        _stripBytes += len(cached.buffer)
+    # most recently used last; MicroPython's OrderedDict has no
+    # move_to_end() or popitem(last=False)
+    _strips[key] = cached
+    while _stripBytes > STRIP_BUDGET and _strips:
+        _stripBytes -= len(_strips.pop(next(iter(_strips))).buffer)
+    return cached
+
+
+def label(text, x=0, y=0, advance=None, scale=NATIVE):
+    # Draw text with its top left corner at x, y and send it. Labels that
+    # are shown over and over, like "TEMP" or "ERROR", are rendered once and
+    # then cost a single blit.
+    start = clock()
+    screen = device()
+    source = strip(text, advance, scale)
+    screen.blit(source, x, y, 0)
+    _covered(x, y, source.width, source.height)
+    flush()
+    _timed(start)
+
+
+class Marquee:
+    # Text scrolling sideways through the pages from y, which is rounded
+    # down to a multiple of 8. The text is rendered once into an off-screen
+    # strip, followed by `gap` blank columns (the screen width by default).
+    #
+    # start() draws the first screen of the strip and lets the controller's
+    # hardware scroll move it, costing no CPU or bus time at all until
+    # stop(). The hardware only rotates what is on the screen, so this suits
+    # text that fits. step() moves the text n columns by re-blitting the
+    # strip into the columns of the band it passes through, for text of any
+    # length.
+    def __init__(self, text, y=0, gap=None, screen=None):
+        if screen is None:
+            screen = device()
+        self.screen = screen
+        self.page0 = y // 8
+        self.page1 = (y + GLYPH_HEIGHT - 1) // 8
+        if self.page1 >= screen.pages:
+            raise ValueError("marquee doesn't fit on the screen")
+        if gap is None:
+            gap = screen.width
+        # columns of the strip that have ink; the rest is the blank gap
+        self.ink = measure(text)
+        self.strip = Bitmap(max(self.ink + gap, screen.width), (self.page1 - self.page0 + 1) * 8)
+        x = 0
+        for i in range(len(text)):
+            source = bitmap(text[i])
+            if source is not None:
+                self.strip.blit(source, x, y - self.page0 * 8, 0)
+            x += ADVANCE
+        band = screen.view[self.page0 * screen.width:(self.page1 + 1) * screen.width]
+        self.band = framebuf.FrameBuffer(band, screen.width, self.strip.height, framebuf.MONO_VLSB)
+        self.offset = 0
+        # columns of the band the text was last painted in; the first paint
+        # takes over the whole band
+        self.shown = (0, screen.width)
+
+    def span(self):
+        # columns x0, x1 of the band the text covers at self.offset
+        width = self.screen.width
+        x0 = width
+        x1 = 0
+        if self.offset < self.ink:
+            x0 = 0
+            x1 = min(width, self.ink - self.offset)
+        wrapped = self.strip.width - self.offset
+        if wrapped < width and self.ink:
+            x0 = min(x0, wrapped)
+            x1 = max(x1, min(width, wrapped + self.ink))
+        return x0, x1
+
+    def paint(self):
+        # Copy the strip from self.offset into the band, wrapping around.
+        # Only the columns the text moves out of or into change: those are
+        # blanked, the text is OR-ed back in, and only they are sent.
+        x0, x1 = self.span()
+        lo = min(x0, self.shown[0])
+        hi = max(x1, self.shown[1])
+        self.shown = (x0, x1)
+        if lo >= hi:
+            return
+        height = self.strip.height
+        self.band.fill_rect(lo, 0, hi - lo, height, 0)
+        self.band.blit(self.strip, -self.offset, 0, 0)
+        if self.offset + self.screen.width > self.strip.width:
+            self.band.blit(self.strip, self.strip.width - self.offset, 0, 0)
+        y = self.page0 * 8
+        self.screen.mark(lo, y, hi - lo, height)
+        # retained cells there no longer show their characters
+        for cells, rows in self.screen.grids.values():
+            _covered(lo, y, hi - lo, height, False, cells)
+        if self.screen is oled:
+            _covered(lo, y, hi - lo, height)
+
+    def start(self, frames=5, left=True):
+        self.paint()
+        self.screen.show()
+        self.screen.hscroll(self.page0, self.page1, left, frames)
+
+    def stop(self):
+        self.screen.stop_scroll()
+
+    def step(self, n=1):
+        self.offset = (self.offset + n) % self.strip.width
+        self.paint()
+        # the marquee's own display, which need not be the one in use
+        if scheduler is not None:
+            scheduler.request(self.screen)
+        else:
+            self.screen.show()
+
+
+class Scheduler:
+    # Caps panel updates at fps frames a second. While started, display(),
+    # line1()-line3(), wrap() and clear() only draw and record the display
+    # as pending; poll(), called from the main loop, sends everything drawn
+    # since the last frame in one show() once the frame interval has passed.
+    #
+    #     frames = ssd1306big.Scheduler(fps=5).start()
+    #     while True:
+    #         ssd1306big.line1(temperature)
+    #         ssd1306big.line2(humidity)
+    #         frames.poll()
+    def __init__(self, fps=20):
+        self.interval = 1000 // fps
+        self.pending = []
+        self.last = None
+
+    def start(self):
+        global scheduler
+        scheduler = self
+        return self
+
+    def stop(self):
+        # go back to immediate updates, sending whatever is still pending
+        global scheduler
+        if scheduler is self:
+            scheduler = None
+        self.flush()
+
+    def request(self, screen):
+        if screen not in self.pending:
+            self.pending.append(screen)
+
+    def due(self):
+        return self.last is None or ticks_diff(ticks_ms(), self.last) >= self.interval
+
+    def poll(self):
+        # send pending updates if a frame is due; True if anything was sent
+        if self.pending and self.due():
+            self.flush()
+            return True
+        return False
+
+    def flush(self):
+        # pending displays take turns sending a window each, so several
+        # panels fill in together rather than one after the other
+        self.last = ticks_ms()
+        busy = self.pending
+        self.pending = []
+        while busy:
+            busy = [screen for screen in busy if screen.step()]
+
+
+class Bus(Scheduler):
+    # Several panels on one I2C bus, e.g. at 0x3C and 0x3D. Once started it
+    # works like Scheduler: the text functions only draw and record which
+    # displays changed, and poll() or flush() sends all of them in one pass.
+    # use() chooses the panel the text functions draw on.
+    #
+    #     bus = ssd1306big.Bus(i2c).start()
+    #     bus.add(0x3C)
+    #     bus.add(0x3D)
+    #     bus.use(0x3C)
+    #     ssd1306big.line1("IN 21.5")
+    #     bus.use(0x3D)
+    #     ssd1306big.line1("OUT 9.0")
+    #     bus.flush()
+    def __init__(self, i2c=None, fps=20):
+        super().__init__(fps)
+        if i2c is None:
+            import machine
+            i2c = machine.I2C(0)
+        self.i2c = i2c
+        self.screens = {}
+
+    def add(self, addr=0x3C, width=WIDTH, height=HEIGHT, external_vcc=False, double_buffer=False):
+        # set up the panel at addr and return its SSD1306_I2C
+        screen = SSD1306_I2C(width, height, self.i2c, addr, external_vcc, double_buffer)
+        self.screens[addr] = screen
+        return screen
+
+    def use(self, addr, scale=NATIVE):
+        # draw on the panel at addr from now on; returns it
+        return use(self.screens[addr], scale)
+
+    def show(self):
+        # send every panel's pending changes now
+        for screen in self.screens.values():
+            self.request(screen)
+        self.flush()
+
+
+# asyncio support. asyncio is only imported when these are used.
+
+def _asyncio():
+    try:
+        import asyncio
+    except ImportError:
+        import uasyncio as asyncio
+    return asyncio
+
+
+async def show_async(screen=None):
+    # show(), yielding to other tasks after every window sent
+    asyncio = _asyncio()
+    if screen is None:
+        screen = device()
+    while screen.step():
+        await asyncio.sleep(0)
+
+
+class Refresher(Scheduler):
+    # Scheduler driven by a background asyncio task instead of poll(), so
+    # the text functions never wait for the bus.
+    #
+    #     refresher = ssd1306big.Refresher(fps=10)
+    #     refresher.start()
+    #     ...
+    #     ssd1306big.wrap("HELLO")   # returns at once
+    def __init__(self, fps=20):
+        super().__init__(fps)
+        self.event = None
+        self.task = None
+
+    def request(self, screen):
+        super().request(screen)
+        if self.event is not None:
+            self.event.set()
+
+    def start(self):
+        asyncio = _asyncio()
+        self.event = asyncio.Event()
+        if self.pending:
+            self.event.set()
+        self.task = asyncio.create_task(self.run())
+        return super().start()
+
+    def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            self.task = None
+        super().stop()
+
+    async def run(self):
+        asyncio = _asyncio()
+        while True:
+            await self.event.wait()
+            self.event.clear()
+            self.last = ticks_ms()
+            while self.pending:
+                await show_async(self.pending.pop(0))
+            wait = self.interval - ticks_diff(ticks_ms(), self.last)
+            if wait > 0:
+                await asyncio.sleep(wait / 1000)
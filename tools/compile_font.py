@@ -0,0 +1,137 @@
+# Font compiler for ssd1306big.
+#
+# Reads the stroke tables of the big font out of ssd1306big.py and writes a
+# Python module holding the rasterized glyphs as bytes literals. When that
+# module is frozen into the MicroPython firmware the bytes stay in flash, so
+# the glyphs cost no RAM. ssd1306big picks the module up automatically if it
+# can be imported.
+#
+# Runs on plain CPython, no hardware needed:
+#
+#     python tools/compile_font.py [ssd1306big.py] [ssd1306big_font.py]
+
+import ast
+import sys
+
+
+# first character code covered by the index
+FIRST = 32
+LAST = 126
+
+
+def load_font(path):
+    # evaluate the stroke tables of ssd1306big.py without importing it: the
+    # built-in glyphs packed in _strokeBlob, and any `font = {...}` entries.
+    # Returns them with GLYPH_HEIGHT, the height glyphs are cut off at.
+    tree = ast.parse(open(path).read(), path)
+    tables = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if isinstance(target, ast.Name) and target.id in ("_strokeBlob", "_strokeStarts", "_glyphIndex", "font", "GLYPH_HEIGHT"):
+            tables[target.id] = ast.literal_eval(node.value)
+    for name in ("_strokeBlob", "_strokeStarts", "_glyphIndex", "GLYPH_HEIGHT"):
+        if name not in tables:
+            raise SystemExit("no %s found in %s" % (name, path))
+    blob = tables["_strokeBlob"]
+    starts = tables["_strokeStarts"]
+    font = {}
+    for code, number in enumerate(tables["_glyphIndex"]):
+        if number:
+            n = number - 1
+            font[chr(FIRST + code)] = tuple(tuple(blob[i:i + 4]) for i in range(starts[n] * 4, starts[n + 1] * 4, 4))
+    font.update(tables.get("font", {}))
+    return font, tables["GLYPH_HEIGHT"]
+
+
+def line(pixels, x1, y1, x2, y2):
+    # the same Bresenham walk as framebuf.FrameBuffer.line()
+    dx = x2 - x1
+    sx = 1 if dx > 0 else -1
+    dx = abs(dx)
+    dy = y2 - y1
+    sy = 1 if dy > 0 else -1
+    dy = abs(dy)
+    steep = dy > dx
+    if steep:
+        x1, y1 = y1, x1
+        dx, dy = dy, dx
+        sx, sy = sy, sx
+    e = 2 * dy - dx
+    for _ in range(dx):
+        if steep:
+            pixels.add((y1, x1))
+        else:
+            pixels.add((x1, y1))
+        while e >= 0:
+            y1 += sy
+            e -= 2 * dx
+        x1 += sx
+        e += 2 * dy
+    pixels.add((x2, y2))
+
+
+def rasterize(strokes, height):
+    # MONO_VLSB bytes, cropped to the rightmost lit column, and the width
+    pixels = set()
+    for x1, y1, x2, y2 in strokes:
+        line(pixels, x1, y1, x2, y2)
+    pixels = set((x, y) for x, y in pixels if x >= 0 and 0 <= y < height)
+    width = max(x for x, y in pixels) + 1
+    data = bytearray((height + 7) // 8 * width)
+    for x, y in pixels:
+        data[(y >> 3) * width + x] |= 1 << (y & 7)
+    return bytes(data), width
+
+
+def compile_font(font, height):
+    index = bytearray(LAST - FIRST + 1)
+    offsets = bytearray()
+    widths = bytearray()
+    bitmaps = bytearray()
+    glyphs = {}
+    for ch in sorted(font):
+        code = ord(ch)
+        strokes = font[ch]
+        if not strokes or not FIRST <= code <= LAST:
+            continue
+        if strokes not in glyphs:
+            data, width = rasterize(strokes, height)
+            glyphs[strokes] = len(widths) + 1
+            offsets += bytes((len(bitmaps) & 0xFF, len(bitmaps) >> 8))
+            widths.append(width)
+            bitmaps += data
+        index[code - FIRST] = glyphs[strokes]
+    return bytes(index), bytes(offsets), bytes(widths), bytes(bitmaps)
+
+
+def write_module(path, height, index, offsets, widths, bitmaps):
+    with open(path, "w") as out:
+        out.write("# Generated by tools/compile_font.py from ssd1306big.py, do not edit.\n\n")
+        out.write("HEIGHT = %d\n" % height)
+        out.write("PAGES = %d\n" % ((height + 7) // 8))
+        out.write("FIRST = %d\n\n" % FIRST)
+        out.write("# glyph number + 1 for each character code from FIRST, 0 if none\n")
+        out.write("INDEX = %r\n\n" % index)
+        out.write("# per glyph: little endian offset into BITMAPS, and width in columns\n")
+        out.write("OFFSETS = %r\n" % offsets)
+        out.write("WIDTHS = %r\n\n" % widths)
+        out.write("# MONO_VLSB, PAGES rows of WIDTHS[n] bytes per glyph\n")
+        out.write("BITMAPS = (\n")
+        for i in range(0, len(bitmaps), 32):
+            out.write("    %r\n" % bitmaps[i:i + 32])
+        out.write(")\n")
+
+
+def main(argv):
+    source = argv[1] if len(argv) > 1 else "ssd1306big.py"
+    target = argv[2] if len(argv) > 2 else "ssd1306big_font.py"
+    font, height = load_font(source)
+    index, offsets, widths, bitmaps = compile_font(font, height)
+    write_module(target, height, index, offsets, widths, bitmaps)
+    print("%s: %d glyphs, %d bytes of bitmaps" % (target, len(widths), len(bitmaps)))
+
+
+if __name__ == "__main__":
+    main(sys.argv)